@@ -2,7 +2,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlmodel import Session, select
-from app.db.session import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_session, get_async_session
 from app.core.config import settings
 from app.models.auth import User, UserRole
 from typing import Optional
@@ -41,6 +42,37 @@ def get_current_user(
         
     return user
 
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_session)
+) -> User:
+    """
+    get_current_user() for async routes, on the async session.
+    Relationships (student_profile, company_profile) can't be lazy-loaded
+    from it; query the profile explicitly.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        email: str = payload.get("sub")
+        if email is None:
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+
+    statement = select(User).where(User.email == email)
+    user = (await session.exec(statement)).first()
+    
+    if user is None:
+        raise credentials_exception
+        
+    return user
+
 def get_optional_user(
     token: Optional[str] = Depends(oauth2_scheme_optional),
     session: Session = Depends(get_session)
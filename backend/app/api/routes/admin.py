@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select, func
 from app.db.session import get_session
 from app.models.auth import User, UserRole
@@ -6,6 +7,9 @@ from app.models.job import Job
 from app.models.application import Application
 from app.schemas import SystemStats, UserAdminView, JobPublic
 from app.api.deps import get_current_admin
+from app.core.skill_taxonomy import reload_taxonomy
+from app.core.metrics import metrics
+from app.core.pagination import keyset_paginate, page_size, split_page, set_next_cursor
 
 router = APIRouter()
 
@@ -33,15 +37,20 @@ def get_system_stats(
 
 @router.get("/users", response_model=list[UserAdminView])
 def get_all_users(
+    response: Response,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_admin),
     limit: int = 50,
-    offset: int = 0
+    cursor: Optional[str] = None
 ):
     """
     List all users (for moderation).
+    Newest first; the X-Next-Cursor response header is the cursor of the next page.
     """
-    users = session.exec(select(User).offset(offset).limit(limit)).all()
+    limit = page_size(limit)
+    statement = keyset_paginate(select(User), User.created_at, User.id, cursor, limit)
+    users, next_cursor = split_page(session.exec(statement).all(), limit)
+    set_next_cursor(response, next_cursor)
     return users
 
 from sqlmodel import delete # Add this import
@@ -86,4 +95,34 @@ def force_delete_job(
         
     session.delete(job)
     session.commit()
-    return {"message": "Job deleted by Admin."}
\ No newline at end of file
+    return {"message": "Job deleted by Admin."}
+
+@router.post("/skills/reload")
+def reload_skill_taxonomy(
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Hot-reload the skill taxonomy data file without a restart.
+    The new taxonomy is compiled first and swapped in atomically;
+    an invalid file leaves the current one active.
+    """
+    try:
+        taxonomy = reload_taxonomy()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to load skill taxonomy: {e}")
+
+    return {
+        "message": "Skill taxonomy reloaded.",
+        "version": taxonomy.version,
+        "skills": len(taxonomy.synonyms),
+    }
+
+
+@router.get("/metrics")
+def get_metrics(
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    In-process metrics of this worker (e.g. per-route query counts and DB time).
+    """
+    return metrics.snapshot()
@@ -1,22 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session, select, func
-from app.db.session import get_session
+from app.db.replica import get_read_session
 from app.models.auth import User, UserRole, Student
-from app.models.job import Job
+from app.models.job import Job, JobViewRollup
 from app.models.application import Application, ApplicationStatus
 from app.api.deps import get_current_user
-from app.schemas import CompanyAnalytics, StudentAnalytics, StatItem
+from app.schemas import CompanyAnalytics, StudentAnalytics, StatItem, ViewBucket
+from app.core.skill_taxonomy import get_taxonomy
 from collections import Counter
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+from app.core.config import settings
+from app.core.job_views import bucket_start
 import re
 
 router = APIRouter()
 
-TECH_KEYWORDS = [
-    "python", "react", "node", "sql", "java", "aws", "docker", 
-    "typescript", "fastapi", "django", "html", "css", "machine learning",
-    "data science", "javascript", "c++", "flutter", "devops"
-]
-
 def extract_skills_from_text(text_list: list[str]) -> list[StatItem]:
     """
     Counts frequency of comma-separated skills (e.g. "Python, React").
@@ -41,17 +40,18 @@ def extract_skills_from_text(text_list: list[str]) -> list[StatItem]:
 def scan_jobs_for_trends(jobs: list[Job]) -> list[StatItem]:
     """
     Scans job descriptions to find most mentioned tech keywords.
+    Keywords come from trending_keywords in the skill taxonomy.
     """
     word_counts = Counter()
+    taxonomy = get_taxonomy()
     
     for job in jobs:
         # Combine title and description for scanning
         text = (job.title + " " + job.description).lower()
         
-        # Check for each keyword
-        for keyword in TECH_KEYWORDS:
-            if keyword in text:
-                word_counts[keyword.title()] += 1
+        # One pass over the text finds every keyword
+        for keyword in taxonomy.find_trending_keywords(text):
+            word_counts[keyword.title()] += 1
                 
     return [
         StatItem(label=k, value=v) 
@@ -60,7 +60,7 @@ def scan_jobs_for_trends(jobs: list[Job]) -> list[StatItem]:
 
 @router.get("/company", response_model=CompanyAnalytics)
 def get_company_analytics(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != UserRole.COMPANY or not current_user.company_profile:
@@ -116,9 +116,47 @@ def get_company_analytics(
         applicant_skills=skill_stats
     )
 
+@router.get("/company/views", response_model=list[ViewBucket])
+def get_company_view_series(
+    granularity: Literal["hour", "day"] = "day",
+    days: int = 30,
+    job_id: Optional[int] = None,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Views over time for the company's jobs (or one of them), oldest bucket first.
+    Read from the hourly/daily rollups; hourly buckets only go back
+    JOB_VIEW_HOURLY_RETENTION_DAYS. Buckets without views are omitted.
+    """
+    if current_user.role != UserRole.COMPANY or not current_user.company_profile:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    company_id = current_user.company_profile.id
+    if granularity == "hour":
+        days = min(days, settings.JOB_VIEW_HOURLY_RETENTION_DAYS)
+    since = bucket_start(datetime.utcnow() - timedelta(days=max(1, days)), granularity)
+
+    # 1. One grouped query over the rollups of the company's jobs
+    statement = (
+        select(JobViewRollup.bucket_start, func.sum(JobViewRollup.views))
+        .join(Job, JobViewRollup.job_id == Job.id)
+        .where(Job.company_id == company_id)
+        .where(JobViewRollup.granularity == granularity)
+        .where(JobViewRollup.bucket_start >= since)
+    )
+    if job_id is not None:
+        statement = statement.where(JobViewRollup.job_id == job_id)
+
+    rows = session.exec(
+        statement.group_by(JobViewRollup.bucket_start).order_by(JobViewRollup.bucket_start)
+    ).all()
+
+    return [ViewBucket(bucket_start=start, views=views) for start, views in rows]
+
 @router.get("/student", response_model=StudentAnalytics)
 def get_student_analytics(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != UserRole.STUDENT or not current_user.student_profile:
@@ -1,62 +1,22 @@
 from datetime import datetime
-import asyncio
-from typing import Optional, Tuple
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel import Session, select
-from app.db.session import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from app.db.session import get_session, get_async_session
 from app.models.auth import User, UserRole
 from app.models.job import Job
 from app.models.application import Application, ApplicationStatus
 from app.schemas import ApplicationPublic, ApplicantPublic
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_async
 from app.models.auth import Company, Student
-from app.core.supabase import supabase
+from app.core.signed_urls import get_signed_urls_async
+from app.core.profile_images import ProfileImageSize, profile_image_variant_path
+from app.core.pagination import MAX_PAGE_SIZE, keyset_paginate, page_size, split_page, set_next_cursor
 
 router = APIRouter()
 
-
-def _create_signed_url(bucket: str, path: str) -> Optional[str]:
-    """Helper to create a signed URL for a file in Supabase storage."""
-    if not path:
-        return None
-    try:
-        res = supabase.storage.from_(bucket).create_signed_url(path, 3600)
-        return res.get("signedURL") if isinstance(res, dict) else res
-    except Exception:
-        return None
-
-
-async def _create_signed_url_async(bucket: str, path: str) -> Optional[str]:
-    """Async wrapper for creating signed URLs - runs in thread pool."""
-    if not path:
-        return None
-    return await asyncio.to_thread(_create_signed_url, bucket, path)
-
-
-async def _batch_create_signed_urls(
-    items: list[Tuple[Optional[str], Optional[str]]]
-) -> list[Tuple[Optional[str], Optional[str]]]:
-    """
-    Batch create signed URLs for multiple items concurrently.
-    Each item is a tuple of (resume_path, profile_image_path).
-    Returns list of tuples (resume_signed_url, profile_image_signed_url).
-    """
-    tasks = []
-    for resume_path, profile_path in items:
-        # Create tasks for both resume and profile image URLs
-        tasks.append(_create_signed_url_async("resumes", resume_path))
-        tasks.append(_create_signed_url_async("profile-images", profile_path))
-    
-    # Run all tasks concurrently
-    results = await asyncio.gather(*tasks)
-    
-    # Pair up results (every 2 results belong to one applicant)
-    paired_results = []
-    for i in range(0, len(results), 2):
-        paired_results.append((results[i], results[i + 1]))
-    
-    return paired_results
-
 @router.post("/{job_id}", response_model=ApplicationPublic)
 def apply_to_job(
     job_id: int,
@@ -106,7 +66,12 @@ def apply_to_job(
     )
     
     session.add(new_application)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError:
+        # Applied by a concurrent request between the check and the insert
+        session.rollback()
+        raise HTTPException(status_code=400, detail="You have already applied for this job")
     session.refresh(new_application)
 
     # 5. Format Response
@@ -166,24 +131,34 @@ def get_my_applications(
 @router.get("/job/{job_id}", response_model=list[ApplicantPublic])
 async def get_job_applicants(
     job_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    image_size: ProfileImageSize = "md",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Company: View all students who applied to a specific job.
     Includes logic to generate secure Resume Links.
-    Uses batched async calls for Supabase signed URLs for better performance.
+    Signed URLs come from the cache or are created in bulk, per bucket.
+    Profile images are signed at image_size ("md" by default, sized for list avatars).
+    Newest first. With a limit, the X-Next-Cursor response header is the cursor
+    of the next page; without one every applicant is returned.
     """
     # 1. Security: Only Companies allowed
-    if current_user.role != UserRole.COMPANY or not current_user.company_profile:
+    company = None
+    if current_user.role == UserRole.COMPANY:
+        company = (await session.exec(select(Company).where(Company.user_id == current_user.id))).first()
+    if not company:
         raise HTTPException(status_code=403, detail="Only companies can view applicants")
 
     # 2. Security: Verify Job Ownership
-    job = session.get(Job, job_id)
+    job = await session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    if job.company_id != current_user.company_profile.id:
+    if job.company_id != company.id:
         raise HTTPException(status_code=403, detail="You do not own this job posting")
 
     # 3. Fetch Applications + Student Info + User Email
@@ -192,28 +167,40 @@ async def get_job_applicants(
         .join(Student, Application.student_id == Student.id)
         .join(User, Student.user_id == User.id)
         .where(Application.job_id == job_id)
-        .order_by(Application.applied_at.desc())
     )
-    
-    results = session.exec(statement).all()
+    if limit is None and not cursor:
+        results = (await session.exec(
+            statement.order_by(Application.applied_at.desc(), Application.id.desc())
+        )).all()
+    else:
+        limit = page_size(limit or MAX_PAGE_SIZE)
+        statement = keyset_paginate(statement, Application.applied_at, Application.id, cursor, limit)
+        results, next_cursor = split_page(
+            (await session.exec(statement)).all(),
+            limit,
+            key=lambda row: (row[0].applied_at, row[0].id)
+        )
+        set_next_cursor(response, next_cursor)
     
     if not results:
         return []
     
-    # 4. Batch create signed URLs for all applicants concurrently
-    # Collect all paths that need signing
-    url_paths = [
-        (student.resume_url, student.profile_image_url)
+    # 4. Sign every resume and profile image of the page in bulk
+    # (cached URLs are reused, the rest is signed in a few requests per bucket)
+    profile_paths = [
+        profile_image_variant_path(student.profile_image_url, image_size)
         for _, student, _ in results
     ]
-    
-    # Generate all signed URLs in parallel
-    signed_urls = await _batch_create_signed_urls(url_paths)
+    signed_urls = await get_signed_urls_async(
+        [("resumes", student.resume_url) for _, student, _ in results]
+        + [("profile-images", path) for path in profile_paths]
+    )
     
     # 5. Format Data with signed URLs
     applicants_list = []
-    for i, (application, student, user) in enumerate(results):
-        secure_resume_link, secure_profile_image_link = signed_urls[i]
+    for (application, student, user), profile_path in zip(results, profile_paths):
+        secure_resume_link = signed_urls.get(("resumes", student.resume_url))
+        secure_profile_image_link = signed_urls.get(("profile-images", profile_path))
         
         applicant_data = ApplicantPublic(
             application_id=application.id,
@@ -235,6 +222,8 @@ async def get_job_applicants(
 
 from app.schemas import ApplicationUpdate # Add this import
 from app.models.notification import Notification, NotificationType
+from app.core.notification_stream import publish_notification
+from app.core.notification_counters import adjust_unread_count
 
 # Status change messages for notifications
 STATUS_MESSAGES = {
@@ -309,6 +298,7 @@ def update_application_status(
     session.add(application)
     
     # 7. Create Notification if status changed and it's a meaningful update
+    notification = None
     if old_status != new_status and new_status in STATUS_MESSAGES:
         # Get the student's user_id
         student = session.get(Student, application.student_id)
@@ -327,11 +317,17 @@ def update_application_status(
                 link="/my-applications"
             )
             session.add(notification)
+            adjust_unread_count(session, student.user_id, 1)
     
     session.commit()
     session.refresh(application)
 
-    # 8. Return with Job/Company details for Schema compliance
+    # 8. Push the notification to the student's open streams
+    if notification is not None:
+        session.refresh(notification)
+        publish_notification(session, notification)
+
+    # 9. Return with Job/Company details for Schema compliance
     return ApplicationPublic(
         id=application.id,
         job_id=application.job_id,
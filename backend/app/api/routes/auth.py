@@ -8,6 +8,8 @@ from app.core.security import get_password_hash, verify_password, create_access_
 from app.core.config import settings
 from datetime import timedelta
 from app.api.deps import get_current_user
+from app.core.profile_images import ProfileImageSize, profile_image_variant_path
+from app.core.signed_urls import get_signed_url
 
 router = APIRouter()
 
@@ -157,12 +159,14 @@ def refresh_access_token(
         )
 
 @router.get("/me", response_model=UserPublic)
-def read_users_me(current_user: User = Depends(get_current_user)):
+def read_users_me(
+    image_size: ProfileImageSize = "lg",
+    current_user: User = Depends(get_current_user)
+):
     """
     Get current user details with their name and profile image.
+    image_size picks the profile image variant to sign ("sm" for avatars).
     """
-    from app.core.supabase import supabase
-    
     # 1. Determine the name and profile image based on Role
     display_name = None
     company_profile_id = None
@@ -175,12 +179,8 @@ def read_users_me(current_user: User = Depends(get_current_user)):
             # Get profile image URL
             if current_user.student_profile.profile_image_url:
                 try:
-                    path = current_user.student_profile.profile_image_url
-                    res = supabase.storage.from_("profile-images").create_signed_url(path, 3600)
-                    if isinstance(res, dict) and "signedURL" in res:
-                        profile_image_url = res["signedURL"]
-                    elif isinstance(res, str):
-                        profile_image_url = res
+                    path = profile_image_variant_path(current_user.student_profile.profile_image_url, image_size)
+                    profile_image_url = get_signed_url("profile-images", path)
                 except Exception as e:
                     print(f"Error generating profile image signed URL: {e}")
             
@@ -192,12 +192,8 @@ def read_users_me(current_user: User = Depends(get_current_user)):
             # Get profile image URL
             if current_user.company_profile.profile_image_url:
                 try:
-                    path = current_user.company_profile.profile_image_url
-                    res = supabase.storage.from_("profile-images").create_signed_url(path, 3600)
-                    if isinstance(res, dict) and "signedURL" in res:
-                        profile_image_url = res["signedURL"]
-                    elif isinstance(res, str):
-                        profile_image_url = res
+                    path = profile_image_variant_path(current_user.company_profile.profile_image_url, image_size)
+                    profile_image_url = get_signed_url("profile-images", path)
                 except Exception as e:
                     print(f"Error generating profile image signed URL: {e}")
 
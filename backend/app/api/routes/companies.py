@@ -1,16 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlmodel import Session
-from app.db.session import get_session
-from app.models.auth import User, UserRole
-from app.api.deps import get_current_user
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_session, get_async_session
+from app.models.auth import User, UserRole, Company
+from app.api.deps import get_current_user, get_current_user_async
 from app.schemas import CompanyUpdate, CompanyPublic
-from app.core.supabase import supabase
-from app.core.image_utils import validate_image, optimize_profile_image
+from app.core.config import settings
+from app.core.signed_urls import get_signed_url, get_signed_url_async
+from app.core.uploads import read_upload
+from app.core.image_utils import validate_image, generate_profile_image_variants_async, MAX_FILE_SIZE_MB
+from app.core.profile_images import ProfileImageSize, profile_image_variant_path, upload_profile_image_variants
 
 router = APIRouter()
 
 @router.get("/profile", response_model=CompanyPublic)
 def get_company_profile(
+    image_size: ProfileImageSize = "lg",
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -26,12 +31,10 @@ def get_company_profile(
     # Generate signed URL for profile image
     if company.profile_image_url:
         try:
-            path = company.profile_image_url
-            res = supabase.storage.from_("profile-images").create_signed_url(path, 3600)
-            if isinstance(res, dict) and "signedURL" in res:
-                company.profile_image_url = res["signedURL"]
-            elif isinstance(res, str):
-                company.profile_image_url = res
+            path = profile_image_variant_path(company.profile_image_url, image_size)
+            url = get_signed_url("profile-images", path)
+            if url:
+                company.profile_image_url = url
         except Exception as e:
             print(f"Error generating profile image signed URL: {e}")
             pass
@@ -69,15 +72,16 @@ def update_company_profile(
 @router.post("/profile-image")
 async def upload_company_profile_image(
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    image_size: ProfileImageSize = "lg",
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Upload and optimize profile image for company.
     - Validates file type (JPEG, PNG, WebP) and size (max 5MB)
-    - Resizes to max 400x400 while maintaining aspect ratio
-    - Compresses to JPEG for optimal storage
-    - Stores in Supabase 'profile-images' bucket
+    - Generates 800/160/64px variants from a single decode (JPEG, or WebP if PROFILE_IMAGE_WEBP)
+    - Uploads all variants to Supabase 'profile-images' bucket concurrently
+    - Returns a signed URL for image_size ("lg" by default)
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -87,64 +91,53 @@ async def upload_company_profile_image(
     if current_user.role != UserRole.COMPANY:
         raise HTTPException(status_code=403, detail="Only companies can upload profile images")
 
-    # 1. Read file content
-    file_content = await file.read()
+    company = (await session.exec(select(Company).where(Company.user_id == current_user.id))).first()
+    if not company:
+        raise HTTPException(status_code=404, detail="Company profile not found")
+
+    # 1. Read file content in chunks (413 as soon as it exceeds MAX_FILE_SIZE_MB)
+    file_content, sniffed_type = await read_upload(file, MAX_FILE_SIZE_MB * 1024 * 1024)
     file_size = len(file_content)
-    logger.info(f"File size: {file_size} bytes, Content-Type: {file.content_type}")
+    logger.info(f"File size: {file_size} bytes, Content-Type: {file.content_type} (sniffed {sniffed_type})")
     
-    # 2. Validate image
-    is_valid, error_msg = validate_image(file.content_type, file_size)
+    # 2. Validate image (type sniffed from the file's first bytes)
+    is_valid, error_msg = validate_image(sniffed_type, file_size)
     if not is_valid:
         logger.error(f"Validation failed: {error_msg}")
         raise HTTPException(status_code=400, detail=error_msg)
 
-    # 3. Optimize image
+    # 3. Generate all size variants from one decode
     try:
-        logger.info("Optimizing image...")
-        optimized_content = optimize_profile_image(file_content)
-        logger.info(f"Optimized size: {len(optimized_content)} bytes")
+        logger.info("Generating image variants...")
+        variants = await generate_profile_image_variants_async(file_content, settings.PROFILE_IMAGE_WEBP)
     except ValueError as e:
         logger.error(f"Image optimization failed: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
-    # 4. Create file path: "company_user_id/profile.jpg"
-    file_path = f"company_{current_user.id}/profile.jpg"
-    logger.info(f"File path: {file_path}")
-
-    # 5. Upload to Supabase bucket
+    # 4. Upload every variant to the Supabase bucket concurrently
     try:
         logger.info("Uploading to Supabase profile-images bucket...")
-        supabase.storage.from_("profile-images").upload(
-            file=optimized_content,
-            path=file_path,
-            file_options={"content-type": "image/jpeg", "upsert": "true"}
-        )
-        logger.info("Upload successful")
+        file_path = await upload_profile_image_variants(f"company_{current_user.id}", variants, settings.PROFILE_IMAGE_WEBP)
+        logger.info(f"Upload successful: {file_path}")
     except Exception as e:
         logger.error(f"Upload Error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to upload image to cloud storage")
 
-    # 6. Update company profile with image path
-    company = current_user.company_profile
-    if not company:
-        raise HTTPException(status_code=404, detail="Company profile not found")
-    
+    # 5. Update company profile with image path
     company.profile_image_url = file_path
     
     try:
         session.add(company)
-        session.commit()
-        session.refresh(company)
+        await session.commit()
         logger.info("Database updated successfully")
     except Exception as e:
         logger.error(f"Database error: {e}", exc_info=True)
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
-    # 7. Generate signed URL for immediate response
+    # 6. Generate signed URL for the requested size
     try:
-        signed_url_response = supabase.storage.from_("profile-images").create_signed_url(file_path, 3600)
-        final_url = signed_url_response.get("signedURL") if isinstance(signed_url_response, dict) else signed_url_response
+        final_url = await get_signed_url_async("profile-images", profile_image_variant_path(file_path, image_size))
     except Exception as e:
         logger.error(f"Error generating signed URL: {e}")
         final_url = file_path
@@ -1,22 +1,24 @@
 from typing import Optional
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlmodel import Session, func, select
-from app.db.session import get_session
-from app.models.auth import User, UserRole
-from app.models.job import Job, JobView, SavedJob
-from app.schemas import JobCreate, JobPublic, JobUpdate, JobRecommendation, CoverLetterRequest, CoverLetterResponse, SkillGapAnalysisResponse
-from app.api.deps import get_current_user, get_optional_user
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from app.db.session import get_session, get_async_session
+from app.db.replica import get_read_session
+from app.core.pagination import keyset_paginate, page_size, split_page, set_next_cursor
+from app.core.job_views import job_view_buffer
+from app.models.auth import User, UserRole, Student, Company
+from app.models.job import Job, SavedJob
+from app.schemas import JobCreate, JobPublic, JobUpdate, JobRecommendation, CandidateMatch, CoverLetterRequest, CoverLetterResponse, SkillGapAnalysisResponse
+from app.api.deps import get_current_user, get_current_user_async, get_optional_user
 from app.core.ai import ai_model
 from app.core.vector_db import vector_db
 from app.core.llm import generate_interview_questions, generate_interview_questions_async, generate_cover_letter_async, generate_skill_gap_analysis_async
-from app.core.skill_matcher import (
-    match_skills,
-    calculate_skill_match_score,
-    extract_skills_from_text,
-    format_skill,
-)
+from app.core.skill_matcher import SkillProfile, calculate_skill_match_score
+from app.core.skill_taxonomy import SkillTaxonomy, get_taxonomy
 from app.core.embedding_cache import generate_and_cache_embedding
+from app.core.candidate_index import student_index, candidate_match_cache, job_fingerprint
 import logging
 from sqlmodel import select, col, or_
 from app.core.embedding_utils import build_student_embedding_text, build_job_embedding_text
@@ -28,15 +30,19 @@ router = APIRouter()
 
 @router.get("/", response_model=list[JobPublic])
 def get_all_jobs(
-    session: Session = Depends(get_session),
+    response: Response,
+    session: Session = Depends(get_read_session),
     limit: int = 50,
+    cursor: Optional[str] = None,
     location: Optional[str] = None,
     job_type: Optional[str] = None
 ):
     """
     Get all active jobs with optional filters.
     Supports location and job_type filtering.
+    Newest first; the X-Next-Cursor response header is the cursor of the next page.
     """
+    limit = page_size(limit)
     statement = select(Job).where(Job.is_active == True)
     
     # Apply filters
@@ -45,9 +51,10 @@ def get_all_jobs(
     if job_type:
         statement = statement.where(Job.job_type == job_type)
     
-    statement = statement.order_by(Job.created_at.desc()).limit(limit)
+    statement = keyset_paginate(statement, Job.created_at, Job.id, cursor, limit)
     
-    jobs = session.exec(statement).all()
+    jobs, next_cursor = split_page(session.exec(statement).all(), limit)
+    set_next_cursor(response, next_cursor)
     
     public_jobs = []
     for job in jobs:
@@ -133,9 +140,11 @@ def create_new_job(
 
 @router.get("/search", response_model=list[JobPublic])
 def search_jobs_sql(
+    response: Response,
     q: str,  # The search query (e.g., "Python")
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     limit: int = 20,
+    cursor: Optional[str] = None,
     location: Optional[str] = None,
     job_type: Optional[str] = None
 ):
@@ -143,7 +152,9 @@ def search_jobs_sql(
     Keyword-based Search (SQL) with Filters.
     Looks for the query string in Title, Description, or Location.
     Case-insensitive. Supports location and job_type filtering.
+    Newest first; the X-Next-Cursor response header is the cursor of the next page.
     """
+    limit = page_size(limit)
     # 1. Build the Query
     # ILIKE is PostgreSQL specific for "Case Insensitive LIKE"
     # We use %query% to find the text anywhere in the string
@@ -163,10 +174,11 @@ def search_jobs_sql(
     if job_type:
         statement = statement.where(Job.job_type == job_type)
     
-    statement = statement.limit(limit)
+    statement = keyset_paginate(statement, Job.created_at, Job.id, cursor, limit)
 
     # 2. Execute
-    jobs = session.exec(statement).all()
+    jobs, next_cursor = split_page(session.exec(statement).all(), limit)
+    set_next_cursor(response, next_cursor)
 
     # 3. Format Response (Add Company Name)
     public_jobs = []
@@ -182,7 +194,7 @@ def search_jobs_sql(
 @router.get("/semantic", response_model=list[JobPublic])
 def search_jobs_semantic(
     q: str, 
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     limit: int = 10,
     location: Optional[str] = None,
     job_type: Optional[str] = None
@@ -249,7 +261,7 @@ def search_jobs_semantic(
 @router.get("/hybrid", response_model=list[JobPublic])
 def search_jobs_hybrid(
     q: str,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     limit: int = 10,
     location: Optional[str] = None,
     job_type: Optional[str] = None
@@ -339,6 +351,73 @@ def search_jobs_hybrid(
     return public_jobs
 
 
+def score_skill_overlap(
+    taxonomy: SkillTaxonomy,
+    skill_profile: SkillProfile,
+    profile_skill_ids: set[int],
+    job_text: str,
+    job_required_ids: Optional[list[int]] = None
+) -> tuple[list[str], list[str], float]:
+    """
+    Skill overlap between a student's profile skills and a job.
+    Returns (matching_skills, missing_skills, skill_score 0.0 to 1.0).
+    Shared by job recommendations and company-side candidate matching.
+    The SkillProfile is built once per student and reused across jobs.
+    Skills are compared as taxonomy integer ids; sorted ids follow key name order.
+    """
+    # Extract skills implied/required by the job, then compute coverage.
+    # Only match against PROFILE SKILLS (student.skills field).
+    if job_required_ids is None:
+        job_required_ids = sorted(taxonomy.extract_skill_ids(job_text))
+
+    if job_required_ids:
+        matching_required_ids = [i for i in job_required_ids if i in profile_skill_ids]
+        missing_required_ids = [i for i in job_required_ids if i not in profile_skill_ids]
+
+        matching_skills = [taxonomy.display_by_id[i] for i in matching_required_ids]
+        missing_skills = [taxonomy.display_by_id[i] for i in missing_required_ids]
+
+        skill_score = len(matching_required_ids) / len(job_required_ids)
+    else:
+        # Fallback: can't extract job-required skills reliably.
+        # Show only positive matches from the student's *profile* skills.
+        matching_profile_skills, _ = skill_profile.match(job_text)
+        matching_skills = matching_profile_skills
+        missing_skills = []
+
+        skill_score = 0
+        if skill_profile.skills:
+            skill_score = len(matching_profile_skills) / len(skill_profile.skills)
+
+    return matching_skills, missing_skills, skill_score
+
+
+def score_location(city: Optional[str], location: Optional[str]) -> float:
+    """Location fit between a student's city and a job location (0.0 to 1.0)."""
+    if not city or not location:
+        return 0
+    
+    # Normalize for comparison
+    student_city = city.lower().strip()
+    job_location = location.lower().strip()
+    
+    if student_city in job_location:
+        return 1.0
+    if "remote" in job_location or "hybrid" in job_location:
+        return 0.8
+    # Partial match (e.g., "New York" in "New York, NY")
+    if any(word in job_location for word in student_city.split() if len(word) > 3):
+        return 0.7
+    return 0
+
+
+def parse_profile_skills(skills: Optional[str]) -> list[str]:
+    """Split the comma-separated profile skills field into a clean list."""
+    if not skills:
+        return []
+    return [s.strip() for s in skills.split(",") if s.strip()]
+
+
 @router.get("/recommendations", response_model=list[JobRecommendation])
 def get_job_recommendations(
     session: Session = Depends(get_session),
@@ -360,12 +439,14 @@ def get_job_recommendations(
 
     # 2. Prepare Skills List for Smart Matching
     # ONLY use profile skills - these are the source of truth set by the student
-    student_skills_list = []
-    if student.skills:
-        student_skills_list = [s.strip() for s in student.skills.split(",") if s.strip()]
+    student_skills_list = parse_profile_skills(student.skills)
+
+    # Extract canonical skill ids from profile (one taxonomy snapshot for the whole request)
+    taxonomy = get_taxonomy()
+    profile_skill_ids = taxonomy.extract_skill_ids(", ".join(student_skills_list))
 
-    # Extract canonical skill keys from profile
-    profile_skill_keys = set(extract_skills_from_text(", ".join(student_skills_list)))
+    # Precompute normalized skill variations once for every candidate job
+    skill_profile = SkillProfile(student_skills_list)
 
     # 3. Get or Generate Cached Embedding (Performance Optimization!)
     query_vector = generate_and_cache_embedding(student, session)
@@ -402,44 +483,12 @@ def get_job_recommendations(
 
         # B. ENHANCED Skill Overlap Score with Smart Matching
         job_text = job.title + " " + job.description
-
-        # Extract skills implied/required by the job, then compute coverage.
-        # Only match against PROFILE SKILLS (student.skills field).
-        job_required_keys = sorted(set(extract_skills_from_text(job_text)))
-
-        if job_required_keys:
-            matching_required_keys = [k for k in job_required_keys if k in profile_skill_keys]
-            missing_required_keys = [k for k in job_required_keys if k not in profile_skill_keys]
-
-            matching_skills = [format_skill(k) for k in matching_required_keys]
-            missing_skills = [format_skill(k) for k in missing_required_keys]
-
-            skill_score = len(matching_required_keys) / len(job_required_keys)
-        else:
-            # Fallback: can't extract job-required skills reliably.
-            # Show only positive matches from the student's *profile* skills.
-            matching_profile_skills, _ = match_skills(student_skills_list, job_text)
-            matching_skills = matching_profile_skills
-            missing_skills = []
-
-            skill_score = 0
-            if student_skills_list:
-                skill_score = len(matching_profile_skills) / len(student_skills_list)
+        matching_skills, missing_skills, skill_score = score_skill_overlap(
+            taxonomy, skill_profile, profile_skill_ids, job_text
+        )
 
         # C. Location Score
-        location_score = 0
-        if student.city and job.location:
-            # Normalize for comparison
-            student_city = student.city.lower().strip()
-            job_location = job.location.lower().strip()
-            
-            if student_city in job_location:
-                location_score = 1.0
-            elif "remote" in job_location or "hybrid" in job_location:
-                location_score = 0.8
-            # Partial match (e.g., "New York" in "New York, NY")
-            elif any(word in job_location for word in student_city.split() if len(word) > 3):
-                location_score = 0.7
+        location_score = score_location(student.city, job.location)
         
         # 50% AI + 30% Skills + 20% Location
         final_score = (semantic_score * 0.5) + (skill_score * 0.3) + (location_score * 0.2)
@@ -513,9 +562,10 @@ def read_my_jobs(
 
 @router.get("/", response_model=list[JobPublic])
 def read_jobs(
+    response: Response,
     session: Session = Depends(get_session),
     current_user: Optional[User] = Depends(get_optional_user),
-    offset: int = 0,
+    cursor: Optional[str] = None,
     limit: int = 20,
 ):
     """
@@ -523,7 +573,9 @@ def read_jobs(
     Public endpoint (no login required to view jobs).
     - For companies: Excludes their own jobs
     - For students/guests: Shows all jobs
+    Newest first; the X-Next-Cursor response header is the cursor of the next page.
     """
+    limit = page_size(limit)
     # 1. Base Query: Active jobs only
     statement = select(Job).where(Job.is_active == True)
    
@@ -534,9 +586,10 @@ def read_jobs(
         if current_user.company_profile:
             statement = statement.where(Job.company_id != current_user.company_profile.id)
     
-    # 3. Apply pagination
-    statement = statement.offset(offset).limit(limit)
-    jobs = session.exec(statement).all()
+    # 3. Apply pagination (keyset on created_at, id)
+    statement = keyset_paginate(statement, Job.created_at, Job.id, cursor, limit)
+    jobs, next_cursor = split_page(session.exec(statement).all(), limit)
+    set_next_cursor(response, next_cursor)
 
     # 4. Enrich with Company Info
     public_jobs = []
@@ -688,6 +741,116 @@ def read_job_by_id(
         
     return JobPublic(**job_data)
 
+@router.get("/{job_id}/candidate-matches", response_model=list[CandidateMatch])
+def get_candidate_matches(
+    job_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+    limit: int = 10
+):
+    """
+    Reverse Matching: find the students who best fit a job posting.
+    Uses one batched top-k over the cached student embeddings, then applies the
+    same weighted scoring as recommendations: Semantic (50%) + Skills (30%) + Location (20%).
+    Results are cached per job version (title/description/location/type), student
+    index and skill taxonomy, for at most CANDIDATE_MATCH_CACHE_SECONDS.
+    """
+    # 1. Security: Only the Company that owns the job
+    if current_user.role != UserRole.COMPANY or not current_user.company_profile:
+        raise HTTPException(status_code=403, detail="Only companies can view candidate matches")
+
+    job = session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job.company_id != current_user.company_profile.id:
+        raise HTTPException(status_code=403, detail="You do not own this job posting")
+
+    limit = max(1, min(limit, 50))
+
+    # 2. Check cache (invalidated by job edits, any student embedding change or a
+    # taxonomy reload; expires after a TTL)
+    index_version = student_index.refresh(session)
+    taxonomy = get_taxonomy()
+    cache_key = (job.id, job_fingerprint(job), index_version, taxonomy.generation, limit)
+    cached = candidate_match_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # 3. Job Vector: reuse the one stored in Qdrant, embed only if missing
+    job_vector = None
+    try:
+        job_vector = vector_db.get_job_vector(job.id)
+    except Exception as e:
+        logger.error(f"Failed to fetch vector for job {job.id}: {e}")
+
+    if not job_vector:
+        job_vector = ai_model.generate_embedding(build_job_embedding_text(
+            title=job.title,
+            description=job.description,
+            job_type=job.job_type,
+            location=job.location
+        ))
+
+    # 4. Single batched top-k over all students (over-fetch for re-ranking)
+    candidates = student_index.top_k(job_vector, k=limit * 3)
+    if not candidates:
+        candidate_match_cache.set(cache_key, [])
+        return []
+
+    scores_map = dict(candidates)
+    students = session.exec(
+        select(Student).where(Student.id.in_(list(scores_map.keys())))
+    ).all()
+
+    # 5. Skill & Location Scoring (job skills extracted once for every candidate)
+    job_text = job.title + " " + job.description
+    job_required_ids = sorted(taxonomy.extract_skill_ids(job_text))
+
+    matches = []
+    for student in students:
+        semantic_score = scores_map.get(student.id, 0)
+
+        student_skills_list = parse_profile_skills(student.skills)
+        profile_skill_ids = taxonomy.extract_skill_ids(", ".join(student_skills_list))
+        matching_skills, missing_skills, skill_score = score_skill_overlap(
+            taxonomy, SkillProfile(student_skills_list), profile_skill_ids, job_text, job_required_ids
+        )
+
+        location_score = score_location(student.city, job.location)
+
+        # 50% AI + 30% Skills + 20% Location
+        final_score = (semantic_score * 0.5) + (skill_score * 0.3) + (location_score * 0.2)
+
+        reason_parts = [f"AI match: {round(semantic_score*100)}%"]
+        if matching_skills:
+            skills_display = ', '.join(matching_skills[:4])
+            if len(matching_skills) > 4:
+                skills_display += f" +{len(matching_skills)-4} more"
+            reason_parts.append(f"Matches: {skills_display}")
+        if location_score == 1.0:
+            reason_parts.append("Location match")
+
+        matches.append(CandidateMatch(
+            student_id=student.id,
+            full_name=student.full_name,
+            university=student.university,
+            city=student.city,
+            cgpa=student.cgpa,
+            skills=student.skills,
+            match_score=round(final_score * 100, 1),
+            matching_skills=matching_skills,
+            missing_skills=missing_skills,
+            why=". ".join(reason_parts) + "."
+        ))
+
+    # 6. Final Sort by Weighted Score
+    matches.sort(key=lambda x: x.match_score, reverse=True)
+    matches = matches[:limit]
+
+    candidate_match_cache.set(cache_key, matches)
+    return matches
+
 @router.post("/reindex")
 def reindex_all_jobs(
     session: Session = Depends(get_session),
@@ -742,6 +905,7 @@ def increment_job_view(
 ):
     """
     Track job views. Prevents duplicates from same IP/User within 24 hours.
+    Views are buffered and written in bulk (see app.core.job_views).
     """
     job = session.get(Job, job_id)
     if not job:
@@ -750,42 +914,18 @@ def increment_job_view(
     # 1. Don't count if Company is viewing their own job
     if current_user and current_user.role == UserRole.COMPANY and current_user.company_profile:
         if job.company_id == current_user.company_profile.id:
-            return {"message": "Owner view ignored", "views": job.views_count}
+            return {"message": "Owner view ignored", "views": job.views_count + job_view_buffer.pending_count(job_id)}
     
-    # 2. Check for duplicate view (Last 24 hours)
+    # 2. Buffer the view unless the same IP or user viewed the job recently
     ip = request.client.host
-    yesterday = datetime.utcnow() - timedelta(days=1)
-    
-    # Logic: Look for a view on this job, after yesterday, matching EITHER user_id OR ip_address
-    query = select(JobView).where(
-        JobView.job_id == job_id,
-        JobView.viewed_at > yesterday
-    )
-    
-    if current_user:
-        query = query.where(or_(JobView.user_id == current_user.id, JobView.ip_address == ip))
-    else:
-        query = query.where(JobView.ip_address == ip)
+    tracked = job_view_buffer.record(job_id, current_user.id if current_user else None, ip)
 
-    existing_view = session.exec(query).first()
-    
-    if not existing_view:
-        # 3. Create Record
-        new_view = JobView(
-            job_id=job_id,
-            ip_address=ip,
-            user_id=current_user.id if current_user else None
-        )
-        session.add(new_view)
-        
-        # 4. Increment Counter
-        job.views_count += 1
-        session.add(job)
-        
-        session.commit()
-        return {"message": "View tracked", "views": job.views_count}
+    # 3. Count includes the views still waiting for the next flush
+    views = job.views_count + job_view_buffer.pending_count(job_id)
+    if tracked:
+        return {"message": "View tracked", "views": views}
     
-    return {"message": "Duplicate view ignored", "views": job.views_count}
+    return {"message": "Duplicate view ignored", "views": views}
 
 def check_is_saved(session: Session, user: Optional[User], job_id: int) -> bool:
     if not user or user.role != UserRole.STUDENT:
@@ -826,7 +966,12 @@ def save_job(
 
     saved_job = SavedJob(user_id=current_user.id, job_id=job_id)
     session.add(saved_job)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError:
+        # Saved by a concurrent request between the check and the insert
+        session.rollback()
+        return {"message": "Job already saved"}
     
     return {"message": "Job saved successfully"}
 
@@ -851,11 +996,16 @@ def unsave_job(
     
     return {"message": "Job removed from saved list"}
 
+async def _get_student_async(session: AsyncSession, user: User) -> Optional[Student]:
+    """Student profile of user (relationships can't be lazy-loaded on an async session)."""
+    return (await session.exec(select(Student).where(Student.user_id == user.id))).first()
+
+
 @router.post("/{job_id}/interview-prep")
 async def get_interview_prep(
     job_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Generates AI-powered interview questions tailored to the student and job.
@@ -866,12 +1016,12 @@ async def get_interview_prep(
         raise HTTPException(status_code=403, detail="Only students can access interview prep")
 
     # 2. Fetch Job
-    job = session.get(Job, job_id)
+    job = await session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     # 3. Fetch Student Data
-    student = current_user.student_profile
+    student = await _get_student_async(session, current_user)
     if not student or not student.resume_text:
         raise HTTPException(
             status_code=400, 
@@ -895,8 +1045,8 @@ async def get_interview_prep(
 async def generate_cover_letter(
     job_id: int,
     request: CoverLetterRequest,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Generates an AI-powered personalized cover letter for a specific job.
@@ -907,15 +1057,20 @@ async def generate_cover_letter(
         raise HTTPException(status_code=403, detail="Only students can generate cover letters")
 
     # 2. Fetch Job with Company info
-    job = session.get(Job, job_id)
-    if not job:
+    row = (await session.exec(
+        select(Job, Company.company_name)
+        .outerjoin(Company, Job.company_id == Company.id)
+        .where(Job.id == job_id)
+    )).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Job not found")
+    job, company_name = row
     
     # Get company name
-    company_name = job.company.company_name if job.company else "the company"
+    company_name = company_name or "the company"
 
     # 3. Fetch Student Data
-    student = current_user.student_profile
+    student = await _get_student_async(session, current_user)
     if not student:
         raise HTTPException(status_code=404, detail="Student profile not found")
     
@@ -943,8 +1098,8 @@ async def generate_cover_letter(
 @router.get("/{job_id}/skill-gap", response_model=SkillGapAnalysisResponse)
 async def analyze_skill_gap(
     job_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Analyzes the skill gap between a job's requirements and the student's profile.
@@ -961,12 +1116,12 @@ async def analyze_skill_gap(
         raise HTTPException(status_code=403, detail="Only students can analyze skill gaps")
 
     # 2. Fetch Job
-    job = session.get(Job, job_id)
+    job = await session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     # 3. Fetch Student Data
-    student = current_user.student_profile
+    student = await _get_student_async(session, current_user)
     if not student:
         raise HTTPException(status_code=404, detail="Student profile not found")
     
@@ -1,11 +1,22 @@
+import asyncio
+import time
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, func
-from app.db.session import get_session
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select, func, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_session, async_engine
 from app.models.auth import User
 from app.models.notification import Notification, NotificationType
 from app.schemas import NotificationPublic, NotificationList, NotificationMarkRead
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_async, oauth2_scheme_optional
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.notification_counters import adjust_unread_count, get_unread_count as read_unread_count, get_unread_count_async
+from app.core.notification_stream import (
+    notification_broker, format_sse, publish_notification, publish_unread_count
+)
+from app.core.pagination import keyset_paginate, page_size, split_page
 
 router = APIRouter()
 
@@ -13,6 +24,7 @@ router = APIRouter()
 @router.get("/", response_model=NotificationList)
 def get_notifications(
     limit: int = 20,
+    cursor: Optional[str] = None,
     unread_only: bool = False,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
@@ -20,34 +32,34 @@ def get_notifications(
     """
     Get notifications for the current user.
     Returns notifications sorted by most recent first.
+    Pass next_cursor back as cursor to get the next page.
     """
+    limit = page_size(limit)
+
     # Build query
     statement = select(Notification).where(Notification.user_id == current_user.id)
     
     if unread_only:
         statement = statement.where(Notification.is_read == False)
     
-    statement = statement.order_by(Notification.created_at.desc()).limit(limit)
-    
-    notifications = session.exec(statement).all()
+    statement = keyset_paginate(statement, Notification.created_at, Notification.id, cursor, limit)
     
-    # Get unread count
-    unread_count = session.exec(
-        select(func.count(Notification.id))
-        .where(Notification.user_id == current_user.id)
-        .where(Notification.is_read == False)
-    ).one()
+    notifications, next_cursor = split_page(session.exec(statement).all(), limit)
     
-    # Get total count
-    total_count = session.exec(
-        select(func.count(Notification.id))
+    # Get total and unread counts in one pass
+    total_count, unread_count = session.exec(
+        select(
+            func.count(Notification.id),
+            func.count(Notification.id).filter(Notification.is_read == False)
+        )
         .where(Notification.user_id == current_user.id)
     ).one()
     
     return NotificationList(
         notifications=[NotificationPublic(**n.model_dump()) for n in notifications],
         unread_count=unread_count,
-        total_count=total_count
+        total_count=total_count,
+        next_cursor=next_cursor
     )
 
 
@@ -58,14 +70,52 @@ def get_unread_count(
 ):
     """
     Get just the unread notification count (lightweight endpoint for polling).
+    Served from the per-user counter (primary-key read, briefly cached).
     """
-    unread_count = session.exec(
-        select(func.count(Notification.id))
-        .where(Notification.user_id == current_user.id)
-        .where(Notification.is_read == False)
-    ).one()
-    
-    return {"unread_count": unread_count}
+    return {"unread_count": read_unread_count(session, current_user.id)}
+
+
+@router.get("/stream")
+async def stream_notifications(
+    token: Optional[str] = None,
+    header_token: Optional[str] = Depends(oauth2_scheme_optional)
+):
+    """
+    Server-Sent Events stream of the current user's notifications.
+    - "unread_count" event on connect and whenever the count changes
+    - "notification" event with each new notification (and the new count)
+    EventSource can't send headers, so the token may also be passed as ?token=.
+    """
+    # 1. Authenticate and read the initial count; the DB connection is
+    #    released before streaming starts
+    async with AsyncSession(async_engine) as session:
+        current_user = await get_current_user_async(header_token or token or "", session)
+        unread_count = await get_unread_count_async(session, current_user.id)
+
+    # 2. Subscribe before the first event so nothing published meanwhile is lost
+    user_id = current_user.id
+    queue = notification_broker.subscribe(user_id)
+
+    async def events():
+        try:
+            yield format_sse("unread_count", {"unread_count": unread_count})
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": ping\n\n"
+                    continue
+                metrics.observe("notification_fanout_ms", (time.time() - message["published_at"]) * 1000)
+                yield format_sse(message["event"], message["data"])
+        finally:
+            notification_broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/mark-read")
@@ -76,22 +126,30 @@ def mark_notifications_read(
 ):
     """
     Mark specific notifications as read.
+    One UPDATE; count is how many were unread before.
     """
+    if not data.notification_ids:
+        return {"message": "Marked 0 notifications as read", "count": 0}
+
     # Update only notifications belonging to this user
-    statement = select(Notification).where(
-        Notification.id.in_(data.notification_ids),
-        Notification.user_id == current_user.id
+    statement = (
+        update(Notification)
+        .where(
+            Notification.user_id == current_user.id,
+            Notification.id.in_(data.notification_ids),
+            Notification.is_read == False
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
     )
     
-    notifications = session.exec(statement).all()
-    
-    for notification in notifications:
-        notification.is_read = True
-        session.add(notification)
-    
+    count = session.exec(statement).rowcount
+    adjust_unread_count(session, current_user.id, -count)
     session.commit()
+    if count:
+        publish_unread_count(session, current_user.id)
     
-    return {"message": f"Marked {len(notifications)} notifications as read"}
+    return {"message": f"Marked {count} notifications as read", "count": count}
 
 
 @router.post("/mark-all-read")
@@ -100,22 +158,25 @@ def mark_all_notifications_read(
     current_user: User = Depends(get_current_user)
 ):
     """
-    Mark all notifications as read for current user.
+    Mark all notifications as read for current user (one UPDATE).
     """
-    statement = select(Notification).where(
-        Notification.user_id == current_user.id,
-        Notification.is_read == False
+    statement = (
+        update(Notification)
+        .where(
+            Notification.user_id == current_user.id,
+            Notification.is_read == False
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
     )
     
-    notifications = session.exec(statement).all()
-    
-    for notification in notifications:
-        notification.is_read = True
-        session.add(notification)
-    
+    count = session.exec(statement).rowcount
+    adjust_unread_count(session, current_user.id, -count)
     session.commit()
+    if count:
+        publish_unread_count(session, current_user.id)
     
-    return {"message": f"Marked {len(notifications)} notifications as read"}
+    return {"message": f"Marked {count} notifications as read", "count": count}
 
 
 @router.delete("/{notification_id}")
@@ -135,8 +196,13 @@ def delete_notification(
     if notification.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    was_unread = not notification.is_read
     session.delete(notification)
+    if was_unread:
+        adjust_unread_count(session, current_user.id, -1)
     session.commit()
+    if was_unread:
+        publish_unread_count(session, current_user.id)
     
     return {"message": "Notification deleted"}
 
@@ -162,6 +228,8 @@ def create_notification(
         link=link
     )
     session.add(notification)
+    adjust_unread_count(session, user_id, 1)
     session.commit()
     session.refresh(notification)
+    publish_notification(session, notification)
     return notification
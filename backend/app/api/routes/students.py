@@ -1,18 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlmodel import Session
-from app.db.session import get_session
-from app.models.auth import User, UserRole
-from app.api.deps import get_current_user
-from app.schemas import StudentUpdate, StudentPublic
-from app.core.pdf_utils import extract_text_from_pdf
-from app.core.supabase import supabase
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_session, get_async_session
+from app.models.auth import User, UserRole, Student
+from app.api.deps import get_current_user, get_current_user_async
+from app.models.resume_ingestion import ResumeIngestion
+from app.schemas import StudentUpdate, StudentPublic, ResumeIngestionPublic
+from app.core.config import settings
+from app.core.uploads import SpooledUpload, spool_upload, read_upload
+from app.core.resume_ingestion import (
+    process_resume_ingestion,
+    content_storage_path,
+    get_resume_content,
+    register_resume_content,
+)
+from app.core.storage import storage
+from app.core.signed_urls import get_signed_url, get_signed_url_async
 from app.core.embedding_cache import generate_and_cache_embedding
-from app.core.image_utils import validate_image, optimize_profile_image
+from app.core.image_utils import validate_image, generate_profile_image_variants_async, MAX_FILE_SIZE_MB
+from app.core.profile_images import ProfileImageSize, profile_image_variant_path, upload_profile_image_variants
 
 router = APIRouter()
 
 @router.get("/profile", response_model=StudentPublic)
 def get_student_profile(
+    image_size: ProfileImageSize = "lg",
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != UserRole.STUDENT:
@@ -25,12 +37,9 @@ def get_student_profile(
     # Generate signed URL for resume
     if student.resume_url:
         try:
-            path = student.resume_url
-            res = supabase.storage.from_("resumes").create_signed_url(path, 3600)
-            if isinstance(res, dict) and "signedURL" in res:
-                student.resume_url = res["signedURL"]
-            elif isinstance(res, str):
-                student.resume_url = res
+            url = get_signed_url("resumes", student.resume_url)
+            if url:
+                student.resume_url = url
         except Exception as e:
             print(f"Error generating resume signed URL: {e}")
             pass
@@ -38,12 +47,10 @@ def get_student_profile(
     # Generate signed URL for profile image
     if student.profile_image_url:
         try:
-            path = student.profile_image_url
-            res = supabase.storage.from_("profile-images").create_signed_url(path, 3600)
-            if isinstance(res, dict) and "signedURL" in res:
-                student.profile_image_url = res["signedURL"]
-            elif isinstance(res, str):
-                student.profile_image_url = res
+            path = profile_image_variant_path(student.profile_image_url, image_size)
+            url = get_signed_url("profile-images", path)
+            if url:
+                student.profile_image_url = url
         except Exception as e:
             print(f"Error generating profile image signed URL: {e}")
             pass
@@ -89,12 +96,25 @@ def update_student_profile(
 
     return student
 
-@router.post("/resume")
+async def _upload_spooled_pdf(spooled: SpooledUpload, file_path: str):
+    """Upload a spooled PDF to the resumes bucket without reading it into memory."""
+    with spooled.open() as f:
+        await storage.upload("resumes", file_path, f, "application/pdf")
+
+
+@router.post("/resume", status_code=202)
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
+    """
+    Upload a resume PDF.
+    The file is stored and recorded right away; text extraction and embedding
+    regeneration run in the background. Poll GET /students/resume/ingestions/{id}
+    for progress, a notification is also sent when processing finishes.
+    """
     import logging
     logger = logging.getLogger(__name__)
     
@@ -103,111 +123,122 @@ async def upload_resume(
     if current_user.role != UserRole.STUDENT:
         raise HTTPException(status_code=403, detail="Only students can upload resumes")
 
-    if file.content_type != "application/pdf":
-        logger.error(f"Invalid file type: {file.content_type}")
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    student = (await session.exec(select(Student).where(Student.user_id == current_user.id))).first()
+    if not student:
+        logger.error("Student profile not found!")
+        raise HTTPException(status_code=404, detail="Student profile not found")
 
-    # 1. Read file into memory
-    logger.info("Reading file content...")
-    file_content = await file.read()
-    logger.info(f"File size: {len(file_content)} bytes")
-    
-    # 2. Create path: "user_id/filename.pdf"
-    safe_filename = file.filename.replace(" ", "_")
-    file_path = f"{current_user.id}/{safe_filename}"
-    logger.info(f"File path: {file_path}")
+    # 1. Stream the upload to a temp file in chunks (413 as soon as it's too big)
+    logger.info("Spooling file content...")
+    spooled = await spool_upload(file, settings.PDF_MAX_FILE_SIZE_MB * 1024 * 1024, suffix=".pdf")
+    logger.info(f"File size: {spooled.size} bytes")
+    handed_off = False
 
     try:
-        # 3. Upload to Supabase Private Bucket
-        logger.info("Uploading to Supabase...")
-        supabase.storage.from_("resumes").upload(
-            file=file_content, 
-            path=file_path, 
-            file_options={"content-type": "application/pdf", "upsert": "true"}
-        )
-        logger.info("Upload to Supabase successful")
-    except Exception as e:
-        logger.error(f"Upload Error: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to upload to cloud storage")
+        # Trust the file's bytes, not the client-declared Content-Type
+        if spooled.content_type != "application/pdf":
+            logger.error(f"Invalid file type: {file.content_type} (sniffed {spooled.content_type})")
+            raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
-    # 4. Extract text for AI (enhanced extraction)
-    logger.info("Extracting text from PDF...")
-    try:
-        extracted_text = extract_text_from_pdf(file_content)
-        logger.info(f"Extracted text length: {len(extracted_text)} characters")
-    except Exception as e:
-        logger.error(f"PDF extraction error: {e}", exc_info=True)
-        extracted_text = ""
+        # 2. Content address: identical PDFs (from any account) share one stored copy
+        digest = spooled.sha256
+        content = await session.run_sync(get_resume_content, digest)
 
-    # 5. Update student object
-    logger.info("Fetching student profile...")
-    student = current_user.student_profile
-    if not student:
-        logger.error("Student profile not found!")
-        raise HTTPException(status_code=404, detail="Student profile not found")
-    
-    logger.info(f"Student ID: {student.id}")
-    student.resume_url = file_path
-    student.resume_text = extracted_text
-    logger.info("Updated student resume_url and resume_text")
-    
-    # 6. Save to database first (commit resume_url and resume_text)
-    try:
-        logger.info("Adding student to session...")
-        session.add(student)
-        logger.info("Committing to database...")
-        session.commit()
-        logger.info("Refreshing student object...")
-        session.refresh(student)
-        logger.info("Database commit successful")
-    except Exception as e:
-        logger.error(f"Database commit error: {e}", exc_info=True)
-        session.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    
-    # 7. Force regenerate embedding cache with the new resume (separate transaction)
-    embedding_cached = False
-    try:
-        logger.info("Force regenerating embedding cache with new resume...")
-        generate_and_cache_embedding(student, session, force_regenerate=True)
-        embedding_cached = True
-        logger.info("Embedding cache regenerated successfully")
-    except Exception as e:
-        logger.error(f"Failed to generate embedding: {e}", exc_info=True)
-        # Continue without caching (non-fatal error)
+        if content:
+            logger.info(f"Identical resume already stored ({digest[:12]}), skipping upload")
+        else:
+            file_path = content_storage_path(digest)
+            logger.info(f"File path: {file_path}")
+            try:
+                # 3. Upload to Supabase Private Bucket (streamed from disk)
+                logger.info("Uploading to Supabase...")
+                await _upload_spooled_pdf(spooled, file_path)
+                logger.info("Upload to Supabase successful")
+            except Exception as e:
+                logger.error(f"Upload Error: {e}", exc_info=True)
+                raise HTTPException(status_code=500, detail="Failed to upload to cloud storage")
+            content = await session.run_sync(register_resume_content, digest, spooled.size)
+
+        file_path = content.file_path
+        already_parsed = bool(content.extracted_text)
 
-    # 8. Generate Signed URL for immediate response
+        # 4. Save resume path and record the ingestion
+        student.resume_url = file_path
+        ingestion = ResumeIngestion(student_id=student.id, file_path=file_path, content_hash=digest)
+        try:
+            session.add(student)
+            session.add(ingestion)
+            await session.commit()
+            await session.refresh(ingestion)
+            logger.info(f"Ingestion {ingestion.id} recorded")
+        except Exception as e:
+            logger.error(f"Database commit error: {e}", exc_info=True)
+            await session.rollback()
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+        # 5. Parse, embed and refresh caches after the response is sent.
+        # The pipeline owns (and removes) the temp file; it isn't needed at all
+        # when this PDF was already parsed.
+        background_tasks.add_task(
+            process_resume_ingestion, ingestion.id, None if already_parsed else spooled.path
+        )
+        handed_off = not already_parsed
+    finally:
+        if not handed_off:
+            spooled.cleanup()
+
+    # 6. Generate Signed URL for immediate response
     try:
         logger.info("Generating signed URL...")
-        signed_url_response = supabase.storage.from_("resumes").create_signed_url(file_path, 600)
-        final_url = signed_url_response.get("signedURL") if isinstance(signed_url_response, dict) else signed_url_response
+        final_url = await get_signed_url_async("resumes", file_path)
         logger.info("Signed URL generated")
     except Exception as e:
         logger.error(f"Error generating signed URL: {e}", exc_info=True)
         final_url = file_path
 
-    logger.info("=== Resume Upload Completed Successfully ===")
+    logger.info("=== Resume Upload Accepted ===")
     
     return {
-        "message": "Resume uploaded successfully", 
+        "message": "Resume uploaded, processing started",
         "resume_url": final_url,
-        "text_preview": extracted_text[:100] + "..." if len(extracted_text) > 100 else extracted_text,
-        "embedding_cached": embedding_cached
+        "ingestion_id": ingestion.id,
+        "status": ingestion.status
     }
 
 
+@router.get("/resume/ingestions/{ingestion_id}", response_model=ResumeIngestionPublic)
+def get_resume_ingestion(
+    ingestion_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Processing status of a resume upload (pending, processing, completed, failed).
+    """
+    if current_user.role != UserRole.STUDENT:
+        raise HTTPException(status_code=403, detail="Only students can view resume uploads")
+
+    student = current_user.student_profile
+    ingestion = session.get(ResumeIngestion, ingestion_id)
+    if not ingestion or not student or ingestion.student_id != student.id:
+        raise HTTPException(status_code=404, detail="Resume upload not found")
+
+    return ingestion
+
+
 @router.post("/profile-image")
 async def upload_profile_image(
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    image_size: ProfileImageSize = "lg",
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Upload and optimize profile image for student.
     - Validates file type (JPEG, PNG, WebP) and size (max 5MB)
-    - Resizes to max 400x400 while maintaining aspect ratio
-    - Compresses to JPEG for optimal storage
-    - Stores in Supabase 'profile-images' bucket
+    - Generates 800/160/64px variants from a single decode (JPEG, or WebP if PROFILE_IMAGE_WEBP)
+    - Uploads all variants to Supabase 'profile-images' bucket concurrently
+    - Returns a signed URL for image_size ("lg" by default)
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -217,64 +248,53 @@ async def upload_profile_image(
     if current_user.role != UserRole.STUDENT:
         raise HTTPException(status_code=403, detail="Only students can upload profile images")
 
-    # 1. Read file content
-    file_content = await file.read()
+    student = (await session.exec(select(Student).where(Student.user_id == current_user.id))).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="Student profile not found")
+
+    # 1. Read file content in chunks (413 as soon as it exceeds MAX_FILE_SIZE_MB)
+    file_content, sniffed_type = await read_upload(file, MAX_FILE_SIZE_MB * 1024 * 1024)
     file_size = len(file_content)
-    logger.info(f"File size: {file_size} bytes, Content-Type: {file.content_type}")
+    logger.info(f"File size: {file_size} bytes, Content-Type: {file.content_type} (sniffed {sniffed_type})")
     
-    # 2. Validate image
-    is_valid, error_msg = validate_image(file.content_type, file_size)
+    # 2. Validate image (type sniffed from the file's first bytes)
+    is_valid, error_msg = validate_image(sniffed_type, file_size)
     if not is_valid:
         logger.error(f"Validation failed: {error_msg}")
         raise HTTPException(status_code=400, detail=error_msg)
 
-    # 3. Optimize image (resize, compress, convert to JPEG)
+    # 3. Generate all size variants from one decode
     try:
-        logger.info("Optimizing image...")
-        optimized_content = optimize_profile_image(file_content)
-        logger.info(f"Optimized size: {len(optimized_content)} bytes")
+        logger.info("Generating image variants...")
+        variants = await generate_profile_image_variants_async(file_content, settings.PROFILE_IMAGE_WEBP)
     except ValueError as e:
         logger.error(f"Image optimization failed: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
-    # 4. Create file path: "profile-images/user_id/profile.jpg"
-    file_path = f"{current_user.id}/profile.jpg"
-    logger.info(f"File path: {file_path}")
-
-    # 5. Upload to Supabase bucket
+    # 4. Upload every variant to the Supabase bucket concurrently
     try:
         logger.info("Uploading to Supabase profile-images bucket...")
-        supabase.storage.from_("profile-images").upload(
-            file=optimized_content,
-            path=file_path,
-            file_options={"content-type": "image/jpeg", "upsert": "true"}
-        )
-        logger.info("Upload successful")
+        file_path = await upload_profile_image_variants(str(current_user.id), variants, settings.PROFILE_IMAGE_WEBP)
+        logger.info(f"Upload successful: {file_path}")
     except Exception as e:
         logger.error(f"Upload Error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to upload image to cloud storage")
 
-    # 6. Update student profile with image path
-    student = current_user.student_profile
-    if not student:
-        raise HTTPException(status_code=404, detail="Student profile not found")
-    
+    # 5. Update student profile with image path
     student.profile_image_url = file_path
     
     try:
         session.add(student)
-        session.commit()
-        session.refresh(student)
+        await session.commit()
         logger.info("Database updated successfully")
     except Exception as e:
         logger.error(f"Database error: {e}", exc_info=True)
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
-    # 7. Generate signed URL for immediate response
+    # 6. Generate signed URL for the requested size
     try:
-        signed_url_response = supabase.storage.from_("profile-images").create_signed_url(file_path, 3600)
-        final_url = signed_url_response.get("signedURL") if isinstance(signed_url_response, dict) else signed_url_response
+        final_url = await get_signed_url_async("profile-images", profile_image_variant_path(file_path, image_size))
     except Exception as e:
         logger.error(f"Error generating signed URL: {e}")
         final_url = file_path
@@ -0,0 +1,178 @@
+"""
+Student Candidate Index
+Keeps the cached student embeddings in an in-process matrix so a job can be
+matched against every student with a single batched top-k, instead of one
+embedding comparison per student.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+from sqlmodel import Session, select, func
+
+from app.core.config import settings
+from app.models.auth import Student
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of (job version, limit) results kept in memory
+MATCH_CACHE_SIZE = 256
+
+
+def job_fingerprint(job: Job) -> str:
+    """
+    Short hash of the job fields that influence matching.
+    Editing a job changes its fingerprint, which acts as the job "version".
+    """
+    raw = "|".join([
+        job.title or "",
+        job.description or "",
+        job.location or "",
+        job.job_type or "",
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class StudentIndex:
+    """
+    Normalized matrix of student embeddings (one row per student).
+    Rebuilt lazily whenever the set of cached embeddings changes.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._matrix = None
+            cls._instance._student_ids = []
+            cls._instance._signature = None
+        return cls._instance
+
+    def _current_signature(self, session: Session) -> Tuple[int, Any, Any]:
+        """
+        Cheap aggregate that changes whenever any student embedding changes.
+        The id sum catches a student swapped for another (one deleted, one
+        added) without the count or the latest update time moving.
+        """
+        count, last_updated, id_sum = session.exec(
+            select(func.count(Student.id), func.max(Student.embedding_updated_at), func.sum(Student.id))
+            .where(Student.embedding_cache != None)
+        ).one()
+        return (count, last_updated, id_sum)
+
+    def _build(self, session: Session) -> None:
+        rows = session.exec(
+            select(Student.id, Student.embedding_cache)
+            .where(Student.embedding_cache != None)
+        ).all()
+
+        student_ids = []
+        vectors = []
+        for student_id, embedding_json in rows:
+            try:
+                vector = json.loads(embedding_json)
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(vector, list) and vector:
+                student_ids.append(student_id)
+                vectors.append(vector)
+
+        if not vectors:
+            self._matrix = None
+            self._student_ids = []
+            return
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._matrix = matrix / norms
+        self._student_ids = student_ids
+        logger.info(f"Student index built with {len(student_ids)} embeddings")
+
+    def refresh(self, session: Session) -> Tuple[int, Any, Any]:
+        """
+        Rebuild the matrix if student embeddings changed since the last build.
+        Returns the signature of the current index (used as its version).
+        """
+        signature = self._current_signature(session)
+        with self._lock:
+            if signature != self._signature:
+                self._build(session)
+                self._signature = signature
+        return signature
+
+    def top_k(self, vector: List[float], k: int) -> List[Tuple[int, float]]:
+        """
+        Cosine similarity of the vector against every student in one matrix product.
+        Returns up to k (student_id, score) pairs, best first.
+        """
+        with self._lock:
+            matrix = self._matrix
+            student_ids = self._student_ids
+
+        if matrix is None or not vector or k <= 0:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape[0] != matrix.shape[1]:
+            logger.warning("Job vector dimension does not match student index")
+            return []
+
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        scores = matrix @ (query / norm)
+        k = min(k, len(student_ids))
+
+        # argpartition is O(n); only the top k get fully sorted
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(student_ids[i], float(scores[i])) for i in top]
+
+
+class CandidateMatchCache:
+    """
+    Small LRU cache of candidate match results keyed by job version.
+    Entries also expire after ttl seconds: profile fields that don't touch the
+    embedding (city, CGPA, university, name) still change the results.
+    """
+
+    def __init__(self, max_size: int = MATCH_CACHE_SIZE, ttl: float = 300):
+        self._max_size = max_size
+        self._ttl = ttl
+        # key -> (value, expires at (monotonic seconds))
+        self._items: "OrderedDict[tuple, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[1]:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: tuple, value: Any) -> None:
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + self._ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+
+
+# Global singletons
+student_index = StudentIndex()
+candidate_match_cache = CandidateMatchCache(ttl=settings.CANDIDATE_MATCH_CACHE_SECONDS)
@@ -1,9 +1,33 @@
 # app/core/config.py
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Campus Career AI"
     DATABASE_URL: str
+    # Optional; derived from DATABASE_URL (postgresql+asyncpg://) when not set
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Adds X-DB-* query stats headers to every response
+    DEBUG: bool = False
+
+    # Database connection pool (per engine; the async engine gets its own pool)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False
+    # Requests running more statements than this are logged as possible N+1s
+    DB_QUERY_COUNT_WARN: int = 50
+
+    # Read replica for read-only endpoints (unset: everything goes to DATABASE_URL)
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # After committing a write, a user's reads go to the primary for this long
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5
+    REPLICA_HEALTH_CHECK_SECONDS: float = 10
+    # Replica is skipped while it's further behind than this
+    REPLICA_MAX_LAG_SECONDS: float = 5
     SECRET_KEY: str
     
     # Qdrant
@@ -21,6 +45,66 @@ class Settings(BaseSettings):
     GROQ_API_KEY: str
     GROQ_MODEL:str = "llama-3.1-8b-instant"
 
+    # Candidate matches per job are recomputed at least this often (profile
+    # edits other than skills don't change the student index)
+    CANDIDATE_MATCH_CACHE_SECONDS: float = 300
+
+    # Skill taxonomy data file (defaults to app/data/skill_taxonomy.json)
+    SKILL_TAXONOMY_PATH: Optional[str] = None
+
+    # Resume PDF extraction (runs in a separate process pool)
+    PDF_MAX_FILE_SIZE_MB: int = 10
+    PDF_MAX_PAGES: int = 20
+    PDF_EXTRACT_TIMEOUT_SECONDS: float = 20
+    PDF_EXTRACT_WORKERS: int = 2
+
+    # Profile image optimization thread pool
+    IMAGE_OPTIMIZE_WORKERS: int = 2
+    # Store profile image variants as WebP instead of JPEG
+    PROFILE_IMAGE_WEBP: bool = False
+
+    # Object storage: "supabase", or "local" (files under STORAGE_LOCAL_DIR, for dev/tests)
+    STORAGE_BACKEND: str = "supabase"
+    STORAGE_LOCAL_DIR: Optional[str] = None
+    STORAGE_HTTP2: bool = True
+    STORAGE_MAX_CONNECTIONS: int = 20
+    STORAGE_TIMEOUT_SECONDS: float = 10
+    STORAGE_UPLOAD_TIMEOUT_SECONDS: float = 60
+
+    # Signed storage URLs (cached per bucket/path, re-signed shortly before expiry)
+    SIGNED_URL_EXPIRES_SECONDS: int = 3600
+    SIGNED_URL_REFRESH_MARGIN_SECONDS: int = 300
+    SIGNED_URL_CACHE_SIZE: int = 10000
+    # Bulk signing for lists: paths per request, concurrent requests
+    SIGNED_URL_BULK_CHUNK_SIZE: int = 100
+    SIGNED_URL_BULK_CONCURRENCY: int = 4
+
+    # Job views: buffered in memory and written in bulk
+    JOB_VIEW_FLUSH_SECONDS: float = 10
+    JOB_VIEW_MAX_PENDING: int = 5000
+    # Views kept for retry while flushes fail; the oldest beyond this are dropped
+    JOB_VIEW_MAX_BUFFERED: int = 50000
+    # Repeat views of a job by the same user or IP within this window aren't counted
+    JOB_VIEW_DEDUPE_SECONDS: float = 86400
+    JOB_VIEW_DEDUPE_MAX_KEYS: int = 200000
+    # Raw job_views rows are pruned after this; hourly rollups after the days below
+    JOB_VIEW_RAW_RETENTION_HOURS: int = 24
+    JOB_VIEW_HOURLY_RETENTION_DAYS: int = 30
+    JOB_VIEW_COMPACTION_SECONDS: float = 3600
+
+    # Notification stream pub/sub: "memory" (single worker) or "postgres" (LISTEN/NOTIFY)
+    NOTIFICATION_PUBSUB_BACKEND: str = "memory"
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: float = 15
+    # How often the postgres backend's LISTEN connection is checked (it's reopened when lost)
+    NOTIFICATION_LISTEN_HEALTH_CHECK_SECONDS: float = 30
+    # In-process cache of unread counters (0 disables) and how often drift is fixed
+    NOTIFICATION_UNREAD_CACHE_SECONDS: float = 5
+    NOTIFICATION_COUNTER_RECONCILE_SECONDS: float = 3600
+    # Read notifications older than this move to notifications_archive (0 keeps everything)
+    NOTIFICATION_RETENTION_DAYS: int = 90
+    NOTIFICATION_ARCHIVE_BATCH_SIZE: int = 1000
+    NOTIFICATION_ARCHIVE_INTERVAL_SECONDS: float = 3600
+
     class Config:
         env_file = ".env"
 
@@ -2,17 +2,32 @@
 Image processing utilities for profile image optimization.
 Handles resizing, compression, and format conversion.
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from typing import Dict, Optional
 from PIL import Image
 import logging
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 # Configuration
 MAX_IMAGE_SIZE = (800, 800)  # Max dimensions for profile images (higher for better quality)
 JPEG_QUALITY = 90  # Quality for JPEG compression (1-100)
+WEBP_QUALITY = 85  # Quality for WebP variants (1-100)
 MAX_FILE_SIZE_MB = 5  # Maximum upload size in MB
 
+# Stored sizes of every profile image (longest side in px).
+# "lg" is the full profile picture, "md" and "sm" are for avatars in lists.
+PROFILE_IMAGE_VARIANTS = {
+    "lg": MAX_IMAGE_SIZE[0],
+    "md": 160,
+    "sm": 64,
+}
+
 ALLOWED_CONTENT_TYPES = {
     "image/jpeg": "JPEG",
     "image/jpg": "JPEG", 
@@ -36,6 +51,54 @@ def validate_image(content_type: str, file_size: int) -> tuple[bool, str]:
     return True, ""
 
 
+def _fit_within(size: tuple[int, int], box: tuple[int, int]) -> tuple[int, int]:
+    """Size of an image scaled down (never up) to fit inside box, keeping aspect ratio."""
+    ratio = min(box[0] / size[0], box[1] / size[1])
+    if ratio >= 1:
+        return size
+    return max(1, round(size[0] * ratio)), max(1, round(size[1] * ratio))
+
+
+def _load_rgb(image_bytes: bytes, box: tuple[int, int]) -> Image.Image:
+    """Decode an upload into an RGB image, flattening transparency onto white."""
+    # Open image from bytes
+    img = Image.open(BytesIO(image_bytes))
+    
+    # JPEG only: let the decoder scale down by 1/2, 1/4 or 1/8 while decoding,
+    # before anything below forces a full-size load (large phone photos)
+    if img.format == 'JPEG':
+        img.draft('RGB', _fit_within(img.size, box))
+    
+    # Convert to RGB if necessary (for PNG with transparency, etc.)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        # Create white background for transparent images
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    return img
+
+
+def _encode(img: Image.Image, webp: bool = False) -> bytes:
+    """Encode without metadata: progressive JPEG, or WebP."""
+    output = BytesIO()
+    if webp:
+        img.save(output, format='WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        img.save(
+            output, 
+            format='JPEG', 
+            quality=JPEG_QUALITY,
+            optimize=True,
+            progressive=True  # Progressive JPEG for faster perceived loading
+        )
+    return output.getvalue()
+
+
 def optimize_profile_image(image_bytes: bytes) -> bytes:
     """
     Optimize profile image for storage and fast loading.
@@ -47,35 +110,13 @@ def optimize_profile_image(image_bytes: bytes) -> bytes:
     Returns optimized image bytes.
     """
     try:
-        # Open image from bytes
-        img = Image.open(BytesIO(image_bytes))
-        
-        # Convert to RGB if necessary (for PNG with transparency, etc.)
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # Create white background for transparent images
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        img = _load_rgb(image_bytes, MAX_IMAGE_SIZE)
         
         # Resize if larger than max dimensions (maintain aspect ratio)
         img.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
         
         # Save optimized image to bytes
-        output = BytesIO()
-        img.save(
-            output, 
-            format='JPEG', 
-            quality=JPEG_QUALITY,
-            optimize=True,
-            progressive=True  # Progressive JPEG for faster perceived loading
-        )
-        output.seek(0)
-        
-        optimized_bytes = output.getvalue()
+        optimized_bytes = _encode(img)
         
         # Log compression stats
         original_size = len(image_bytes)
@@ -90,6 +131,73 @@ def optimize_profile_image(image_bytes: bytes) -> bytes:
         raise ValueError(f"Failed to process image: {str(e)}")
 
 
+def generate_profile_image_variants(image_bytes: bytes, webp: bool = False) -> Dict[str, bytes]:
+    """
+    Produce every size in PROFILE_IMAGE_VARIANTS from a single decode.
+    The image is decoded once (at roughly the largest variant's size), then each
+    smaller variant is resized from the previous one instead of from the original.
+    
+    Returns {variant name: encoded bytes}.
+    """
+    try:
+        largest = max(PROFILE_IMAGE_VARIANTS.values())
+        img = _load_rgb(image_bytes, (largest, largest))
+        
+        variants = {}
+        # Largest first, so every resize starts from an already small image
+        for name, size in sorted(PROFILE_IMAGE_VARIANTS.items(), key=lambda item: -item[1]):
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            variants[name] = _encode(img, webp)
+        
+        sizes = ", ".join(f"{name}={len(data)}" for name, data in variants.items())
+        logger.info(f"Image variants generated from {len(image_bytes)} bytes: {sizes}")
+        
+        return variants
+        
+    except Exception as e:
+        logger.error(f"Error generating image variants: {e}")
+        raise ValueError(f"Failed to process image: {str(e)}")
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_OPTIMIZE_WORKERS,
+                thread_name_prefix="image-optimize"
+            )
+        return _executor
+
+
+async def optimize_profile_image_async(image_bytes: bytes) -> bytes:
+    """
+    optimize_profile_image() on a small bounded thread pool.
+    Pillow releases the GIL while decoding, resizing and encoding, so this keeps
+    the event loop free, and the pool size caps concurrent decodes (and their memory).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), optimize_profile_image, image_bytes)
+
+
+async def generate_profile_image_variants_async(image_bytes: bytes, webp: bool = False) -> Dict[str, bytes]:
+    """generate_profile_image_variants() on the same bounded thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), generate_profile_image_variants, image_bytes, webp)
+
+
+def shutdown_image_executor():
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def get_image_dimensions(image_bytes: bytes) -> tuple[int, int]:
     """Get image dimensions (width, height)."""
     try:
@@ -0,0 +1,325 @@
+"""
+Job View Write-behind Buffer
+Counting a view used to cost a dedupe SELECT, an INSERT into job_views and an
+UPDATE of jobs.views_count on every job page load, all contending for the row
+lock of popular jobs. Views are now:
+- deduplicated in memory: a TTL set of (job, viewer) keys, where the viewer is
+  the user and the IP address, each remembered for JOB_VIEW_DEDUPE_SECONDS;
+- buffered and flushed every JOB_VIEW_FLUSH_SECONDS (or as soon as
+  JOB_VIEW_MAX_PENDING views wait) as one bulk INSERT into job_views plus one
+  UPDATE jobs ... FROM (VALUES (job_id, n), ...) for the counters;
+- flushed one last time on graceful shutdown.
+
+Views of jobs or users deleted while the views were buffered are dropped at
+flush time (job_views_orphaned) instead of failing the whole batch on the
+foreign keys. If a flush fails anyway, the views are retried with the next
+one, keeping at most JOB_VIEW_MAX_BUFFERED (the oldest are dropped first).
+
+Each flush also adds the views to job_view_rollups (views per job per hour
+and per day), which analytics reads instead of raw rows. job_view_compactor
+prunes raw job_views rows after JOB_VIEW_RAW_RETENTION_HOURS and hourly
+rollups after JOB_VIEW_HOURLY_RETENTION_DAYS; daily rollups are kept.
+
+Each worker process dedupes on its own, and the dedupe set starts empty after
+a restart. The number of buffered views is the job_views_buffered gauge.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, column, delete, insert, text, update, values
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.periodic import PeriodicJob
+from app.db.session import engine
+from app.models.auth import User
+from app.models.job import Job, JobView, JobViewRollup
+
+logger = logging.getLogger(__name__)
+
+# (job_id, user_id, ip_address, viewed_at)
+_View = Tuple[int, Optional[int], Optional[str], datetime]
+
+ROLLUP_GRANULARITIES = ("hour", "day")
+COMPACTION_BATCH_SIZE = 5000
+
+
+def bucket_start(viewed_at: datetime, granularity: str) -> datetime:
+    hour = viewed_at.replace(minute=0, second=0, microsecond=0)
+    return hour if granularity == "hour" else hour.replace(hour=0)
+
+
+class JobViewBuffer:
+    def __init__(self, flush_interval: float, dedupe_ttl: float, max_keys: int, max_pending: int,
+                 max_buffered: int):
+        self.flush_interval = flush_interval
+        self.dedupe_ttl = dedupe_ttl
+        self.max_keys = max_keys
+        self.max_pending = max_pending
+        self.max_buffered = max_buffered
+        # (job_id, viewer) -> forget at (monotonic seconds). Every key gets the
+        # same TTL, so insertion order is expiry order.
+        self._seen: "OrderedDict[Tuple[int, str], float]" = OrderedDict()
+        self._pending: List[_View] = []
+        self._pending_per_job: Counter = Counter()
+        self._lock = threading.Lock()
+        # Serializes flushes (periodic loop vs. shutdown)
+        self._flush_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _expire(self, now: float):
+        """Drop expired keys, and the oldest ones beyond max_keys. Caller holds the lock."""
+        while self._seen:
+            key, forget_at = next(iter(self._seen.items()))
+            if forget_at > now and len(self._seen) <= self.max_keys:
+                break
+            del self._seen[key]
+
+    def record(self, job_id: int, user_id: Optional[int], ip_address: Optional[str]) -> bool:
+        """
+        Buffer a view unless the same user or IP viewed the job within the
+        dedupe window. Returns True if the view counts.
+        """
+        now = time.monotonic()
+        viewers = [f"ip:{ip_address}"] if ip_address else []
+        if user_id is not None:
+            viewers.append(f"user:{user_id}")
+
+        with self._lock:
+            self._expire(now)
+            if any((job_id, viewer) in self._seen for viewer in viewers):
+                metrics.inc("job_views_deduplicated")
+                return False
+            for viewer in viewers:
+                self._seen[(job_id, viewer)] = now + self.dedupe_ttl
+            self._pending.append((job_id, user_id, ip_address, datetime.utcnow()))
+            self._pending_per_job[job_id] += 1
+            pending = len(self._pending)
+
+        metrics.set_gauge("job_views_buffered", pending)
+        if pending >= self.max_pending:
+            self._wake()
+        return True
+
+    def pending_count(self, job_id: int) -> int:
+        """Views of job_id not written yet (to add to views_count in responses)."""
+        with self._lock:
+            return self._pending_per_job.get(job_id, 0)
+
+    def _wake(self):
+        if self._loop is not None and self._wakeup is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Loop already closed; stop() flushes what's left
+                pass
+
+    def _take(self) -> List[_View]:
+        with self._lock:
+            views, self._pending = self._pending, []
+            self._pending_per_job.clear()
+        metrics.set_gauge("job_views_buffered", 0)
+        return views
+
+    def _put_back(self, views: List[_View]):
+        """Requeue views of a failed flush ahead of newer ones, keeping at most max_buffered."""
+        with self._lock:
+            room = max(self.max_buffered - len(self._pending), 0)
+            dropped = views[:max(len(views) - room, 0)]
+            views = views[len(dropped):]
+            self._pending = views + self._pending
+            for job_id, *_ in views:
+                self._pending_per_job[job_id] += 1
+            pending = len(self._pending)
+        metrics.set_gauge("job_views_buffered", pending)
+        if dropped:
+            logger.warning(f"Job view buffer full, dropped the {len(dropped)} oldest views")
+            metrics.inc("job_views_dropped", len(dropped))
+
+    @staticmethod
+    def _drop_orphans(session: Session, views: List[_View]) -> List[_View]:
+        """
+        Keep only views whose job (and user, if any) still exists. The rows are
+        locked FOR KEY SHARE until commit so they can't be deleted in between.
+        """
+        job_ids = {job_id for job_id, *_ in views}
+        user_ids = {user_id for _, user_id, _, _ in views if user_id is not None}
+        live_jobs = set(session.exec(
+            select(Job.id).where(Job.id.in_(job_ids)).with_for_update(key_share=True)
+        ).all())
+        live_users = set(session.exec(
+            select(User.id).where(User.id.in_(user_ids)).with_for_update(key_share=True)
+        ).all()) if user_ids else set()
+
+        kept = [
+            view for view in views
+            if view[0] in live_jobs and (view[1] is None or view[1] in live_users)
+        ]
+        if len(kept) < len(views):
+            metrics.inc("job_views_orphaned", len(views) - len(kept))
+        return kept
+
+    @staticmethod
+    def _increment_counters(session: Session, per_job: Counter):
+        if session.get_bind().dialect.name == "postgresql":
+            increments = values(
+                column("job_id", Integer), column("n", Integer), name="increments"
+            ).data(list(per_job.items()))
+            session.execute(
+                update(Job)
+                .where(Job.id == increments.c.job_id)
+                .values(views_count=Job.views_count + increments.c.n)
+            )
+        else:
+            # No column aliases for VALUES elsewhere (SQLite): one executemany UPDATE
+            session.execute(
+                text("UPDATE jobs SET views_count = views_count + :n WHERE id = :job_id"),
+                [{"job_id": job_id, "n": n} for job_id, n in per_job.items()]
+            )
+
+    @staticmethod
+    def _update_rollups(session: Session, views: List[_View]):
+        """Add the views to their hour and day buckets (insert or increment)."""
+        buckets = Counter(
+            (job_id, granularity, bucket_start(viewed_at, granularity))
+            for job_id, _, _, viewed_at in views
+            for granularity in ROLLUP_GRANULARITIES
+        )
+        dialect_insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+        upsert = dialect_insert(JobViewRollup).values([
+            {"job_id": job_id, "granularity": granularity, "bucket_start": start, "views": n}
+            for (job_id, granularity, start), n in buckets.items()
+        ])
+        session.execute(upsert.on_conflict_do_update(
+            index_elements=["job_id", "granularity", "bucket_start"],
+            set_={"views": JobViewRollup.views + upsert.excluded.views}
+        ))
+
+    def flush(self) -> int:
+        """
+        Write the buffered views: one bulk INSERT, one aggregated UPDATE of the
+        counters and one rollup upsert, in a single transaction. Views of deleted
+        jobs or users are dropped first. On failure the views go back into the buffer
+        for the next flush. Returns how many views were written.
+        """
+        with self._flush_lock:
+            views = self._take()
+            if not views:
+                return 0
+
+            start = time.perf_counter()
+
+            try:
+                with Session(engine) as session:
+                    live_views = self._drop_orphans(session, views)
+                    if not live_views:
+                        return 0
+                    per_job = Counter(job_id for job_id, *_ in live_views)
+                    session.execute(insert(JobView), [
+                        {"job_id": job_id, "user_id": user_id, "ip_address": ip, "viewed_at": viewed_at}
+                        for job_id, user_id, ip, viewed_at in live_views
+                    ])
+                    self._increment_counters(session, per_job)
+                    self._update_rollups(session, live_views)
+                    session.commit()
+            except Exception as e:
+                logger.error(f"Flushing {len(views)} job views failed, keeping them for the next flush: {e}")
+                metrics.inc("job_view_flush_errors")
+                self._put_back(views)
+                return 0
+
+            metrics.inc("job_views_flushed", len(live_views))
+            metrics.observe("job_view_flush_ms", (time.perf_counter() - start) * 1000)
+            return len(live_views)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await asyncio.to_thread(self.flush)
+
+    def start(self):
+        """Start the periodic flush on the running event loop (app startup)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the periodic flush and write what's left (app shutdown)."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._loop = None
+        written = await asyncio.to_thread(self.flush)
+        if written:
+            logger.info(f"Flushed {written} buffered job views on shutdown")
+
+
+# Global instance
+job_view_buffer = JobViewBuffer(
+    flush_interval=settings.JOB_VIEW_FLUSH_SECONDS,
+    dedupe_ttl=settings.JOB_VIEW_DEDUPE_SECONDS,
+    max_keys=settings.JOB_VIEW_DEDUPE_MAX_KEYS,
+    max_pending=settings.JOB_VIEW_MAX_PENDING,
+    max_buffered=settings.JOB_VIEW_MAX_BUFFERED
+)
+
+
+def _delete_in_batches(model, condition) -> int:
+    """Delete matching rows COMPACTION_BATCH_SIZE at a time, one short transaction each."""
+    deleted = 0
+    while True:
+        with Session(engine) as session:
+            ids = session.exec(select(model.id).where(condition).limit(COMPACTION_BATCH_SIZE)).all()
+            if not ids:
+                return deleted
+            session.exec(delete(model).where(model.id.in_(ids)))
+            session.commit()
+        deleted += len(ids)
+
+
+def compact_job_views(now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Prune raw views past JOB_VIEW_RAW_RETENTION_HOURS (already counted in the
+    rollups) and hourly rollups past JOB_VIEW_HOURLY_RETENTION_DAYS.
+    Returns the number of deleted rows of each kind.
+    """
+    now = now or datetime.utcnow()
+    raw_cutoff = now - timedelta(hours=settings.JOB_VIEW_RAW_RETENTION_HOURS)
+    hourly_cutoff = now - timedelta(days=settings.JOB_VIEW_HOURLY_RETENTION_DAYS)
+
+    start = time.perf_counter()
+    result = {
+        "raw_views": _delete_in_batches(JobView, JobView.viewed_at < raw_cutoff),
+        "hourly_rollups": _delete_in_batches(
+            JobViewRollup,
+            (JobViewRollup.granularity == "hour") & (JobViewRollup.bucket_start < hourly_cutoff)
+        ),
+    }
+    metrics.inc("job_views_compacted", result["raw_views"])
+    metrics.observe("job_view_compaction_ms", (time.perf_counter() - start) * 1000)
+    if any(result.values()):
+        logger.info(f"Job view compaction: {result}")
+    return result
+
+
+# Global instance
+job_view_compactor = PeriodicJob("job_view_compaction", compact_job_views, settings.JOB_VIEW_COMPACTION_SECONDS)
@@ -0,0 +1,69 @@
+"""
+In-process Metrics
+A small thread-safe registry of counters, gauges and observations (count, sum,
+max), keyed by metric name plus optional labels. Snapshot served at
+GET /admin/metrics; each worker process reports its own numbers.
+"""
+import threading
+from typing import Dict, Tuple
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> _LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format(name: str, labels: _LabelKey) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, _LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, _LabelKey], float] = {}
+        # (name, labels) -> [count, sum, max]
+        self._observations: Dict[Tuple[str, _LabelKey], list] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def add_gauge(self, name: str, delta: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            entry = self._observations.get(key)
+            if entry is None:
+                self._observations[key] = [1, value, value]
+            else:
+                entry[0] += 1
+                entry[1] += value
+                entry[2] = max(entry[2], value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": {_format(n, l): v for (n, l), v in sorted(self._counters.items())},
+                "gauges": {_format(n, l): v for (n, l), v in sorted(self._gauges.items())},
+                "observations": {
+                    _format(n, l): {"count": c, "sum": round(s, 3), "max": round(m, 3)}
+                    for (n, l), (c, s, m) in sorted(self._observations.items())
+                },
+            }
+
+
+# Global instance
+metrics = Metrics()
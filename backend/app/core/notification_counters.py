@@ -0,0 +1,185 @@
+"""
+Unread Notification Counters
+notification_counters keeps each user's unread count, so polling it is a
+primary-key read instead of a COUNT(*) over their notifications.
+
+- adjust_unread_count() changes the counter in the same transaction as the
+  notification change (create +1, mark read -n, delete unread -1); callers
+  commit both together.
+- get_unread_count() reads it through a small in-process TTL cache
+  (NOTIFICATION_UNREAD_CACHE_SECONDS, 0 disables). Adjustments invalidate the
+  entry in this worker once their transaction commits (invalidating earlier
+  would let a concurrent read cache the pre-commit count); other workers may
+  serve the old count until it expires.
+- reconcile_unread_counters() recounts and fixes counters that drifted (rows
+  changed outside these paths); it runs every NOTIFICATION_COUNTER_RECONCILE_SECONDS.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session as ORMSession
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.periodic import PeriodicJob
+from app.db.session import engine
+from app.models.notification import Notification, NotificationCounter
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BATCH_SIZE = 500
+
+
+class UnreadCountCache:
+    def __init__(self, ttl: float, max_size: int = 50000):
+        self.ttl = ttl
+        self.max_size = max_size
+        # user_id -> (count, expires at (monotonic seconds))
+        self._entries: Dict[int, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[int]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[1]:
+                del self._entries[user_id]
+                return None
+            return entry[0]
+
+    def set(self, user_id: int, count: int):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.clear()
+            self._entries[user_id] = (count, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+# Global instance
+unread_count_cache = UnreadCountCache(settings.NOTIFICATION_UNREAD_CACHE_SECONDS)
+
+
+def _invalidate_after_commit(session, user_id: int):
+    session.info.setdefault("unread_count_changed", set()).add(user_id)
+
+
+@event.listens_for(ORMSession, "after_commit")
+def _after_commit(session):
+    for user_id in session.info.pop("unread_count_changed", ()):
+        unread_count_cache.invalidate(user_id)
+
+
+@event.listens_for(ORMSession, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("unread_count_changed", None)
+
+
+def _insert(session):
+    return postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+
+def adjust_unread_count(session: Session, user_id: int, delta: int):
+    """
+    Add delta to the user's counter inside the caller's transaction (no commit).
+    The cached count is dropped when that transaction commits.
+    """
+    if not delta:
+        return
+    upsert = _insert(session)(NotificationCounter).values(user_id=user_id, unread_count=delta)
+    session.exec(upsert.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"unread_count": NotificationCounter.unread_count + upsert.excluded.unread_count}
+    ))
+    _invalidate_after_commit(session, user_id)
+
+
+def get_unread_count(session: Session, user_id: int) -> int:
+    count = unread_count_cache.get(user_id)
+    if count is None:
+        counter = session.get(NotificationCounter, user_id)
+        # No row: the user never had an unread notification
+        count = max(0, counter.unread_count) if counter else 0
+        unread_count_cache.set(user_id, count)
+    return count
+
+
+async def get_unread_count_async(session: AsyncSession, user_id: int) -> int:
+    count = unread_count_cache.get(user_id)
+    if count is None:
+        counter = await session.get(NotificationCounter, user_id)
+        count = max(0, counter.unread_count) if counter else 0
+        unread_count_cache.set(user_id, count)
+    return count
+
+
+def _recount(session: Session, user_id: int):
+    """Set the counter to the current number of unread notifications, in one statement."""
+    actual = (
+        select(func.count(Notification.id))
+        .where(Notification.user_id == user_id)
+        .where(Notification.is_read == False)
+        .scalar_subquery()
+    )
+    upsert = _insert(session)(NotificationCounter).values(user_id=user_id, unread_count=actual)
+    session.exec(upsert.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"unread_count": upsert.excluded.unread_count}
+    ))
+    _invalidate_after_commit(session, user_id)
+
+
+def reconcile_unread_counters() -> int:
+    """
+    Compare every counter with a fresh count and recount the ones that differ.
+    A counter fixed while a notification of that user is being written may
+    still be off by that one write; the next run corrects it.
+    Returns how many counters were fixed.
+    """
+    start = time.perf_counter()
+    with Session(engine) as session:
+        actual = dict(session.exec(
+            select(Notification.user_id, func.count(Notification.id))
+            .where(Notification.is_read == False)
+            .group_by(Notification.user_id)
+        ).all())
+        stored = dict(session.exec(
+            select(NotificationCounter.user_id, NotificationCounter.unread_count)
+        ).all())
+
+    drifted = [
+        user_id for user_id in set(actual) | set(stored)
+        if actual.get(user_id, 0) != stored.get(user_id, 0)
+    ]
+    for i in range(0, len(drifted), RECONCILE_BATCH_SIZE):
+        with Session(engine) as session:
+            for user_id in drifted[i:i + RECONCILE_BATCH_SIZE]:
+                _recount(session, user_id)
+            session.commit()
+
+    metrics.observe("notification_counter_reconcile_ms", (time.perf_counter() - start) * 1000)
+    if drifted:
+        metrics.inc("notification_counter_drift", len(drifted))
+        logger.warning(f"Fixed {len(drifted)} drifted unread notification counters")
+    return len(drifted)
+
+
+# Global instance
+notification_counter_reconciler = PeriodicJob(
+    "notification_counter_reconcile",
+    reconcile_unread_counters,
+    settings.NOTIFICATION_COUNTER_RECONCILE_SECONDS
+)
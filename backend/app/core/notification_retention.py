@@ -0,0 +1,89 @@
+"""
+Notification Retention
+Read notifications older than NOTIFICATION_RETENTION_DAYS move from
+notifications to notifications_archive, so the table the feed reads stays
+bounded. Unread notifications are never archived, so the unread counters
+don't change.
+
+Rows move NOTIFICATION_ARCHIVE_BATCH_SIZE at a time, each batch in its own
+short transaction (copy, then delete by id). Rows another transaction has
+locked are skipped (SKIP LOCKED on Postgres) and picked up on the next run.
+notification_archiver runs this every NOTIFICATION_ARCHIVE_INTERVAL_SECONDS.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, literal
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.periodic import PeriodicJob
+from app.db.session import engine
+from app.models.notification import Notification, NotificationArchive
+
+logger = logging.getLogger(__name__)
+
+_ARCHIVED_COLUMNS = ("id", "user_id", "type", "title", "message", "link", "is_read", "created_at")
+
+
+def _archive_batch(cutoff: datetime, batch_size: int) -> int:
+    with Session(engine) as session:
+        ids = session.exec(
+            select(Notification.id)
+            .where(Notification.is_read == True)
+            .where(Notification.created_at < cutoff)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            return 0
+
+        archived_at = datetime.utcnow()
+        session.exec(
+            insert(NotificationArchive).from_select(
+                [*_ARCHIVED_COLUMNS, "archived_at"],
+                select(
+                    *(getattr(Notification, name) for name in _ARCHIVED_COLUMNS),
+                    literal(archived_at)
+                ).where(Notification.id.in_(ids))
+            )
+        )
+        session.exec(delete(Notification).where(Notification.id.in_(ids)))
+        session.commit()
+    return len(ids)
+
+
+def archive_old_notifications(now: Optional[datetime] = None) -> int:
+    """
+    Move read notifications older than the retention period to the archive,
+    batch by batch until none is left. Returns how many were archived.
+    """
+    if settings.NOTIFICATION_RETENTION_DAYS <= 0:
+        return 0
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+
+    start = time.perf_counter()
+    archived = 0
+    while True:
+        moved = _archive_batch(cutoff, settings.NOTIFICATION_ARCHIVE_BATCH_SIZE)
+        archived += moved
+        if moved < settings.NOTIFICATION_ARCHIVE_BATCH_SIZE:
+            break
+
+    metrics.inc("notifications_archived", archived)
+    metrics.observe("notification_archive_ms", (time.perf_counter() - start) * 1000)
+    if archived:
+        logger.info(f"Archived {archived} read notifications older than {cutoff.isoformat()}")
+    return archived
+
+
+# Global instance
+notification_archiver = PeriodicJob(
+    "notification_archive",
+    archive_old_notifications,
+    settings.NOTIFICATION_ARCHIVE_INTERVAL_SECONDS
+)
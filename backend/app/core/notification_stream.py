@@ -0,0 +1,257 @@
+"""
+Notification Event Stream
+Pub/sub behind GET /notifications/stream (Server-Sent Events), so clients get
+new notifications and unread-count changes pushed instead of polling.
+
+publish() hands an event for a user to the pub/sub backend, which delivers
+it to every open stream of that user in this process:
+- "memory" (default): in-process only, enough for a single worker.
+- "postgres": NOTIFY on a channel every worker LISTENs to, so a stream gets
+  events published by any worker (NOTIFICATION_PUBSUB_BACKEND).
+
+Metrics: notification_stream_connections (open streams), notification_fanout_ms
+(publish to hand-off to the stream), notification_stream_dropped (events
+dropped for streams too slow to keep up) and notification_listen_reconnects
+(times the postgres backend had to reopen its LISTEN connection).
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.notification_counters import get_unread_count
+from app.models.notification import Notification
+from app.schemas import NotificationPublic
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per stream before new ones are dropped
+STREAM_QUEUE_SIZE = 100
+# Backoff between attempts to reopen a lost LISTEN connection
+LISTEN_RECONNECT_MAX_DELAY_SECONDS = 30
+
+PG_CHANNEL = "notification_events"
+
+
+class InProcessPubSub:
+    """Delivers published messages straight to this process's subscribers."""
+
+    def __init__(self, deliver: Callable[[dict], None]):
+        self.deliver = deliver
+
+    def publish(self, message: dict):
+        self.deliver(message)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+class PostgresPubSub:
+    """
+    NOTIFY/LISTEN on PG_CHANNEL. publish() sends the NOTIFY on a pooled
+    connection of the sync engine (blocking, like the routes calling it);
+    start() opens one dedicated asyncpg connection per worker to LISTEN.
+
+    That connection is watched: when it closes (termination listener) or stops
+    answering the periodic health check, it's reopened, with backoff, and
+    LISTENs again. Events published while it was down are lost; streams pick
+    up the current state when the client next reconnects.
+    """
+
+    def __init__(self, deliver: Callable[[dict], None]):
+        self.deliver = deliver
+        self._conn = None
+        self._lost: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, message: dict):
+        from app.db.session import engine
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {
+                "channel": PG_CHANNEL,
+                "payload": json.dumps(message, default=str),
+            })
+            conn.commit()
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            self.deliver(json.loads(payload))
+        except ValueError:
+            logger.error(f"Ignoring malformed notification event: {payload[:200]}")
+
+    async def _connect(self):
+        import asyncpg
+
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = await asyncpg.connect(dsn)
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda connection: lost.set())
+        await conn.add_listener(PG_CHANNEL, self._on_notify)
+        self._conn, self._lost = conn, lost
+
+    async def _healthy(self) -> bool:
+        """Wait for the connection to drop or the next health check; False if it's lost."""
+        try:
+            await asyncio.wait_for(self._lost.wait(), timeout=settings.NOTIFICATION_LISTEN_HEALTH_CHECK_SECONDS)
+            return False
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await asyncio.wait_for(self._conn.execute("SELECT 1"), timeout=settings.NOTIFICATION_LISTEN_HEALTH_CHECK_SECONDS)
+            return True
+        except Exception as e:
+            logger.warning(f"LISTEN connection health check failed: {e}")
+            return False
+
+    async def _watch(self):
+        while True:
+            if await self._healthy():
+                continue
+
+            logger.warning(f"Lost the LISTEN connection on '{PG_CHANNEL}', reconnecting")
+            self._conn.terminate()
+            delay = 1
+            while True:
+                try:
+                    await self._connect()
+                    break
+                except Exception as e:
+                    logger.error(f"Reopening the LISTEN connection failed, retrying in {delay}s: {e}")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, LISTEN_RECONNECT_MAX_DELAY_SECONDS)
+            metrics.inc("notification_listen_reconnects")
+            logger.info(f"Listening for notification events on '{PG_CHANNEL}' again")
+
+    async def start(self):
+        await self._connect()
+        self._task = asyncio.create_task(self._watch())
+        logger.info(f"Listening for notification events on '{PG_CHANNEL}'")
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+
+class NotificationBroker:
+    def __init__(self, backend: str = "memory"):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        if backend == "postgres":
+            self.pubsub = PostgresPubSub(self._deliver)
+        else:
+            self.pubsub = InProcessPubSub(self._deliver)
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Queue receiving the user's events; call unsubscribe() when the stream ends."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(queue)
+        metrics.add_gauge("notification_stream_connections", 1)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        with self._lock:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+        metrics.add_gauge("notification_stream_connections", -1)
+
+    def has_listeners(self, user_id: int) -> bool:
+        """Whether an event for the user may reach a stream (always, with the postgres backend)."""
+        if not isinstance(self.pubsub, InProcessPubSub):
+            return True
+        with self._lock:
+            return bool(self._subscribers.get(user_id))
+
+    def publish(self, user_id: int, event: str, data: Any):
+        """
+        Send an event to the user's open streams (in any worker with the
+        postgres backend). Safe to call from worker threads. Never raises:
+        a lost event only delays the update until the client reconnects.
+        """
+        message = {"user_id": user_id, "event": event, "data": data, "published_at": time.time()}
+        try:
+            self.pubsub.publish(message)
+        except Exception as e:
+            logger.error(f"Publishing {event} event for user {user_id} failed: {e}")
+            metrics.inc("notification_publish_errors")
+
+    def _deliver(self, message: dict):
+        """Hand a message to the local streams of its user, on the event loop."""
+        loop = self._loop
+        if loop is None:
+            return
+        with self._lock:
+            queues = list(self._subscribers.get(message.get("user_id"), ()))
+        if not queues:
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue, queues, message)
+        except RuntimeError:
+            # Event loop closed (shutting down)
+            pass
+
+    @staticmethod
+    def _enqueue(queues, message: dict):
+        for queue in queues:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                metrics.inc("notification_stream_dropped")
+
+    async def start(self):
+        """Bind to the running event loop and start listening (app startup)."""
+        self._loop = asyncio.get_running_loop()
+        await self.pubsub.start()
+
+    async def stop(self):
+        await self.pubsub.stop()
+        self._loop = None
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# Global instance
+notification_broker = NotificationBroker(settings.NOTIFICATION_PUBSUB_BACKEND)
+
+
+def publish_notification(session: Session, notification: Notification):
+    """Push a committed notification, with the new unread count, to the user's streams."""
+    if not notification_broker.has_listeners(notification.user_id):
+        return
+    notification_broker.publish(notification.user_id, "notification", {
+        "notification": NotificationPublic(**notification.model_dump()).model_dump(mode="json"),
+        "unread_count": get_unread_count(session, notification.user_id),
+    })
+
+
+def publish_unread_count(session: Session, user_id: int):
+    """Push the user's unread count after notifications were read or deleted."""
+    if not notification_broker.has_listeners(user_id):
+        return
+    notification_broker.publish(user_id, "unread_count", {"unread_count": get_unread_count(session, user_id)})
@@ -0,0 +1,72 @@
+"""
+Keyset (Cursor) Pagination
+List endpoints page on (created_at, id), newest first, instead of OFFSET:
+the next page continues strictly after the last row of the previous one,
+so every page is one index range scan however deep the client scrolls, and
+rows inserted meanwhile don't shift or repeat items.
+
+Cursors are opaque to clients (base64 of the last row's key). List endpoints
+keep returning a plain JSON array and put the cursor of the next page in the
+X-Next-Cursor header (absent on the last page); endpoints returning an
+object carry it as a next_cursor field.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 100
+
+T = TypeVar("T")
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps({"t": created_at.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(created_at, id) of the last row of the previous page. 400 on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page_size(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_paginate(statement, created_col, id_col, cursor: Optional[str], limit: int):
+    """
+    Order statement newest first on (created_col, id_col), start after the
+    cursor and fetch one row more than the page, to know if another page follows.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return statement.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[T],
+    limit: int,
+    key: Callable[[T], Tuple[datetime, int]] = lambda row: (row.created_at, row.id)
+) -> Tuple[List[T], Optional[str]]:
+    """Rows of the page and the cursor of the next page (None on the last page)."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]):
+    if cursor:
+        response.headers[CURSOR_HEADER] = cursor
@@ -1,22 +1,60 @@
 import pdfplumber
 import io
+import mmap
+import os
 import re
-from typing import Dict
+import signal
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple, Union
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+
+class PDFExtractionTimeout(Exception):
+    """Raised inside an extraction worker when a document exceeds its time budget."""
+
+
+@contextmanager
+def _open_pdf_source(source: Union[bytes, str]):
+    """
+    Yield a binary stream for pdfplumber. A file path is memory-mapped
+    (falling back to a plain file handle) so the PDF isn't copied into memory.
+    """
+    if isinstance(source, bytes):
+        yield io.BytesIO(source)
+        return
+
+    with open(source, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some filesystems can't be mapped
+            yield f
+            return
+        with mapped:
+            yield mapped
+
+
+def extract_text_from_pdf(source: Union[bytes, str], max_pages: Optional[int] = None) -> str:
     """
     Enhanced PDF text extraction with section detection and better structure preservation.
     Returns cleaned, structured text optimized for AI embeddings.
+    Accepts the PDF bytes or a path to the file.
+    Only the first max_pages pages are read when a limit is given.
     """
     text_content = []
     
     try:
-        print(f"PDF Size: {len(file_bytes)} bytes")
+        size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+        print(f"PDF Size: {size} bytes")
         
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            print(f"Found {len(pdf.pages)} pages")
+        with _open_pdf_source(source) as stream, pdfplumber.open(stream) as pdf:
+            pages = pdf.pages
+            print(f"Found {len(pages)} pages")
+            if max_pages is not None and len(pages) > max_pages:
+                print(f"Page limit reached: reading first {max_pages} pages only")
+                pages = pages[:max_pages]
             
-            for i, page in enumerate(pdf.pages):
+            for i, page in enumerate(pages):
                 # Try regular text extraction first
                 text = page.extract_text()
                 
@@ -25,6 +63,9 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
                     text = text.strip()
                     text_content.append(text)
                     print(f"Page {i+1}: Extracted {len(text)} chars")
+                elif not page.chars:
+                    # No text layer at all, layout mode can't find anything either
+                    print(f"Page {i+1}: No text found (possibly image-based)")
                 else:
                     # Fallback: Try extracting with layout preservation
                     try:
@@ -34,6 +75,8 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
                             print(f"Page {i+1}: Extracted {len(text)} chars (layout mode)")
                         else:
                             print(f"Page {i+1}: No text found (possibly image-based)")
+                    except PDFExtractionTimeout:
+                        raise
                     except:
                         print(f"Page {i+1}: Failed layout extraction")
         
@@ -44,46 +87,140 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
         
         return full_text
     
+    except PDFExtractionTimeout:
+        raise
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return ""
 
+
+def extract_text_with_limits(source: Union[bytes, str], max_pages: int, timeout: float) -> str:
+    """
+    Entry point for the extraction process pool (see app.core.pdf_worker).
+    Arms a real-time timer so a pathological document aborts itself
+    instead of keeping the worker busy forever.
+    """
+    expired = []
+
+    def on_timeout(signum, frame):
+        expired.append(True)
+        raise PDFExtractionTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        text = extract_text_from_pdf(source, max_pages=max_pages)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+    # pdfplumber wraps some parser errors, so the timeout may have been swallowed
+    if expired:
+        raise PDFExtractionTimeout()
+    return text
+
+# Section headers in priority order. Each gets its own line in the cleaned text.
+# When two headers overlap (e.g. "SKILLS" inside "TECHNICAL SKILLS"), the earlier one wins.
+SECTION_HEADERS = [
+    'EXPERIENCE', 'WORK EXPERIENCE', 'PROFESSIONAL EXPERIENCE',
+    'EDUCATION', 'ACADEMIC BACKGROUND',
+    'SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES',
+    'PROJECTS', 'PERSONAL PROJECTS',
+    'CERTIFICATIONS', 'ACHIEVEMENTS', 'AWARDS',
+    'SUMMARY', 'OBJECTIVE', 'PROFILE'
+]
+
+# Precompiled cleanup patterns (compiled once at import instead of on every call)
+_SPACES_RE = re.compile(r' +')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+# Bullet glyphs become "- "; the spaces after them are consumed here so no
+# second space-collapsing pass is needed after the replacement
+_BULLET_RE = re.compile(r'[•◦○] *')
+
+_HEADERS_LOWER = [h.lower() for h in SECTION_HEADERS]
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+# (KELVIN SIGN, LONG S, dotted/dotless I), mapped one-to-one so positions don't shift
+_CASEFOLD_CHARS = '\u212a\u017f\u0130\u0131'
+_CASEFOLD_SPECIALS = str.maketrans(_CASEFOLD_CHARS, 'ksii')
+
+
+def _header_occurrences(text: str) -> List[Tuple[int, int, int]]:
+    """
+    Every (priority, start, end) header occurrence, overlapping ones included.
+    Plain substring search on a lowercased copy, which finds exactly what a
+    case-insensitive re.sub per header would.
+    """
+    if not text.isascii() and any(ch in text for ch in _CASEFOLD_CHARS):
+        text = text.translate(_CASEFOLD_SPECIALS)
+    lowered = text.lower()
+
+    occurrences = []
+    for priority, header in enumerate(_HEADERS_LOWER):
+        size = len(header)
+        i = lowered.find(header)
+        while i != -1:
+            occurrences.append((priority, i, i + size))
+            i = lowered.find(header, i + 1)
+    return occurrences
+
+
+def _header_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Sorted spans of the headers to put on their own lines.
+    Overlapping occurrences are resolved by header priority, the same result as
+    running one re.sub per header in SECTION_HEADERS order.
+    """
+    occurrences = _header_occurrences(text)
+    if not occurrences:
+        return []
+
+    occurrences.sort()
+    starts: List[int] = []
+    spans: List[Tuple[int, int]] = []
+    for _, start, end in occurrences:
+        i = bisect_left(starts, start)
+        # Kept spans never overlap, so only the neighbours need checking
+        if i > 0 and spans[i - 1][1] > start:
+            continue
+        if i < len(spans) and spans[i][0] < end:
+            continue
+        starts.insert(i, start)
+        spans.insert(i, (start, end))
+    return spans
+
+
 def clean_pdf_text(text: str) -> str:
     """
     Cleans and structures PDF text for better AI processing.
     Preserves section headers and important formatting.
+    Headers are located in a single scan and spliced in one join,
+    instead of one regex substitution (and string copy) per header.
     """
     if not text:
         return ""
     
     # Remove excessive whitespace but keep paragraph breaks
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _SPACES_RE.sub(' ', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     
     # Fix common PDF extraction issues
-    text = text.replace('•', '- ')
-    text = text.replace('◦', '- ')
-    text = text.replace('○', '- ')
+    text = _BULLET_RE.sub('- ', text)
     
     # Ensure section headers are on new lines
-    section_headers = [
-        'EXPERIENCE', 'WORK EXPERIENCE', 'PROFESSIONAL EXPERIENCE',
-        'EDUCATION', 'ACADEMIC BACKGROUND',
-        'SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES',
-        'PROJECTS', 'PERSONAL PROJECTS',
-        'CERTIFICATIONS', 'ACHIEVEMENTS', 'AWARDS',
-        'SUMMARY', 'OBJECTIVE', 'PROFILE'
-    ]
-    
-    for header in section_headers:
-        # Add newlines around section headers for better structure
-        text = re.sub(f'({header})', r'\n\n\1\n', text, flags=re.IGNORECASE)
+    spans = _header_spans(text)
+    if spans:
+        parts = []
+        last = 0
+        for start, end in spans:
+            parts.append(text[last:start])
+            parts.append('\n\n')
+            parts.append(text[start:end])
+            parts.append('\n')
+            last = end
+        parts.append(text[last:])
+        text = ''.join(parts)
     
-    # Clean up multiple spaces again after processing
-    text = re.sub(r' +', ' ', text)
-    text = text.strip()
-    
-    return text
+    return text.strip()
 
 def extract_sections(text: str) -> Dict[str, str]:
     """
@@ -0,0 +1,166 @@
+"""
+PDF Extraction Worker Pool
+Runs resume text extraction in a dedicated process pool so pdfplumber never
+parses on the event loop thread. Each document gets a byte-size limit, a page
+limit and a time budget: a hostile or huge PDF costs one worker slot, not the server.
+
+A worker that ignores its time budget can only be stopped by recycling the
+whole pool (ProcessPoolExecutor can't kill a single worker and keep going).
+The other extractions running on that pool then fail with BrokenProcessPool;
+they are retried on the fresh pool instead of failing their uploads.
+
+At most PDF_EXTRACT_WORKERS documents are submitted at a time, and a
+document's hard deadline starts once it has a worker: uploads queued behind
+slow documents wait without eating into their own budget.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+from app.core.config import settings
+from app.core.pdf_utils import PDFExtractionTimeout, extract_text_with_limits
+
+logger = logging.getLogger(__name__)
+
+# Extra seconds the event loop waits past the in-worker timer before
+# it gives up on the worker and recycles the pool
+HARD_TIMEOUT_GRACE_SECONDS = 5
+
+# Runs per document when the pool breaks under it (recycled for another
+# document, or a worker died)
+MAX_ATTEMPTS = 2
+
+
+class PDFTooLargeError(ValueError):
+    """The document exceeds PDF_MAX_FILE_SIZE_MB."""
+
+
+def validate_pdf_size(file_size: int) -> tuple[bool, str]:
+    """
+    Validate PDF upload size.
+    Returns (is_valid, error_message)
+    """
+    max_bytes = settings.PDF_MAX_FILE_SIZE_MB * 1024 * 1024
+    if file_size > max_bytes:
+        return False, f"File too large. Maximum size: {settings.PDF_MAX_FILE_SIZE_MB}MB"
+    return True, ""
+
+
+class PDFWorkerPool:
+    _instance = None
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+    # One slot per worker, bound to the event loop that uses it
+    _slots: Optional[asyncio.Semaphore] = None
+    _slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting PDF extraction pool ({settings.PDF_EXTRACT_WORKERS} workers)")
+                # spawn, not fork: the API process holds model and client threads
+                # that must not be copied into the workers
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.PDF_EXTRACT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(settings.PDF_EXTRACT_WORKERS)
+            self._slots_loop = loop
+        return self._slots
+
+    def _recycle(self, executor: ProcessPoolExecutor):
+        """
+        Kill the workers of a stuck or broken pool; the next call starts a fresh one.
+        Its other pending tasks fail with BrokenProcessPool (and get retried).
+        """
+        with self._lock:
+            if self._executor is not executor:
+                # Already recycled by another task
+                return
+            self._executor = None
+
+        # ProcessPoolExecutor has no public way to stop a running task
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                process.kill()
+            except Exception:
+                pass
+        executor.shutdown(wait=False)
+
+    async def _extract_once(self, source: Union[bytes, str]) -> str:
+        async with self._get_slots():
+            return await self._extract_on_free_worker(source)
+
+    async def _extract_on_free_worker(self, source: Union[bytes, str]) -> str:
+        """Run one extraction; the caller holds a slot, so a worker is free and the deadline starts now."""
+        timeout = settings.PDF_EXTRACT_TIMEOUT_SECONDS
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            executor,
+            extract_text_with_limits,
+            source,
+            settings.PDF_MAX_PAGES,
+            timeout
+        )
+
+        try:
+            return await asyncio.wait_for(future, timeout + HARD_TIMEOUT_GRACE_SECONDS)
+        except PDFExtractionTimeout:
+            logger.warning(f"PDF extraction exceeded {timeout}s, aborted by worker")
+            raise asyncio.TimeoutError()
+        except asyncio.TimeoutError:
+            logger.error("PDF extraction worker unresponsive, recycling pool")
+            self._recycle(executor)
+            raise
+        except BrokenProcessPool:
+            self._recycle(executor)
+            raise
+
+    async def extract_text(self, source: Union[bytes, str]) -> str:
+        """
+        Extract resume text off the event loop.
+        source is the PDF bytes or, preferably, a path to a spooled copy
+        (the worker then maps the file instead of receiving a pickled copy).
+        Raises PDFTooLargeError, or asyncio.TimeoutError when the document
+        doesn't finish within PDF_EXTRACT_TIMEOUT_SECONDS.
+        """
+        size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+        is_valid, error_msg = validate_pdf_size(size)
+        if not is_valid:
+            raise PDFTooLargeError(error_msg)
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                return await self._extract_once(source)
+            except BrokenProcessPool:
+                if attempt == MAX_ATTEMPTS:
+                    logger.error(f"PDF extraction pool broke {attempt} times under this document, giving up")
+                    raise
+                logger.warning("PDF extraction pool broke (recycled or a worker died), retrying on a fresh pool")
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global singleton instance
+pdf_worker_pool = PDFWorkerPool()
@@ -0,0 +1,45 @@
+"""
+Periodic Background Jobs
+Runs a blocking maintenance function (compaction, reconciliation, retention)
+every few seconds in a worker thread, from app startup to shutdown. Every
+worker process runs its own copy, so the functions must be safe to run
+concurrently. Failures are logged and counted as periodic_job_errors.
+"""
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    def __init__(self, name: str, func: Callable[[], object], interval: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.func)
+            except Exception as e:
+                logger.error(f"Periodic job '{self.name}' failed: {e}")
+                metrics.inc("periodic_job_errors", job=self.name)
+
+    def start(self):
+        """Start on the running event loop (app startup). Disabled when interval <= 0."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,78 @@
+"""
+Profile Image Storage
+Every profile image is stored in several sizes (see PROFILE_IMAGE_VARIANTS):
+
+    {owner}/profile/lg.jpg   <- path saved on the Student/Company row
+    {owner}/profile/md.jpg
+    {owner}/profile/sm.jpg
+
+Only the "lg" path is kept in the database; the others are derived from it, so
+an endpoint can sign whichever size the caller displays. Images uploaded before
+variants existed ("{owner}/profile.jpg") only have one size, which is served for
+every request.
+"""
+import asyncio
+import logging
+import re
+from typing import Dict, Literal, Optional
+
+from app.core.storage import storage
+from app.core.image_utils import PROFILE_IMAGE_VARIANTS
+from app.core.signed_urls import invalidate_signed_url
+
+logger = logging.getLogger(__name__)
+
+PROFILE_IMAGES_BUCKET = "profile-images"
+
+ProfileImageSize = Literal["sm", "md", "lg"]
+
+_VARIANT_PATH_RE = re.compile(r"^(?P<prefix>.+/profile)/lg\.(?P<ext>jpg|webp)$")
+
+_CONTENT_TYPES = {
+    "jpg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+
+def profile_image_path(owner: str, variant: str = "lg", webp: bool = False) -> str:
+    """Storage path of one variant of an owner's profile image."""
+    ext = "webp" if webp else "jpg"
+    return f"{owner}/profile/{variant}.{ext}"
+
+
+def profile_image_variant_path(path: Optional[str], size: ProfileImageSize) -> Optional[str]:
+    """
+    Storage path of the requested size, derived from the stored ("lg") path.
+    Legacy single-size paths are returned unchanged.
+    """
+    if not path:
+        return path
+    match = _VARIANT_PATH_RE.match(path)
+    if not match:
+        return path
+    return f"{match.group('prefix')}/{size}.{match.group('ext')}"
+
+
+async def upload_profile_image_variants(owner: str, variants: Dict[str, bytes], webp: bool = False) -> str:
+    """
+    Upload all variants concurrently.
+    Returns the path to store on the profile (the "lg" variant).
+    Raises if any upload fails.
+    Cached signed URLs of the overwritten paths are dropped.
+    """
+    content_type = _CONTENT_TYPES["webp" if webp else "jpg"]
+    paths = []
+    uploads = []
+    for variant, data in variants.items():
+        if variant not in PROFILE_IMAGE_VARIANTS:
+            raise ValueError(f"Unknown profile image variant: {variant}")
+        path = profile_image_path(owner, variant, webp)
+        paths.append(path)
+        uploads.append(storage.upload(PROFILE_IMAGES_BUCKET, path, data, content_type))
+
+    await asyncio.gather(*uploads)
+    # Same paths, new content: don't hand out URLs clients may have cached the old image under
+    for path in paths:
+        invalidate_signed_url(PROFILE_IMAGES_BUCKET, path)
+    logger.info(f"Uploaded {len(uploads)} profile image variants for {owner}")
+    return profile_image_path(owner, "lg", webp)
@@ -0,0 +1,256 @@
+"""
+Resume Ingestion Pipeline
+Background processing for uploaded resumes: PDF text extraction, embedding
+regeneration and cache refresh. The upload endpoint only persists the file and
+records an ingestion; progress is tracked on the ResumeIngestion row and the
+student gets a notification when processing finishes.
+
+Uploads are content-addressed (SHA-256 of the bytes, see ResumeContent): an
+identical PDF is stored, parsed and embedded once, whichever account uploads it.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from app.db.session import engine
+from app.models.auth import Student
+from app.models.notification import Notification, NotificationType
+from app.models.resume_ingestion import ResumeIngestion, ResumeContent, IngestionStatus
+from app.core.pdf_worker import pdf_worker_pool
+from app.core.embedding_cache import generate_and_cache_embedding
+from app.core.embedding_utils import build_student_embedding_text
+from app.core.uploads import remove_spooled_file
+from app.core.notification_stream import publish_notification
+from app.core.notification_counters import adjust_unread_count
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest used as the content address of an upload."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_storage_path(digest: str) -> str:
+    """Storage path (in the resumes bucket) shared by every upload of the same PDF."""
+    return f"content/{digest}.pdf"
+
+
+def get_resume_content(session: Session, digest: Optional[str]) -> Optional[ResumeContent]:
+    if not digest:
+        return None
+    return session.exec(
+        select(ResumeContent).where(ResumeContent.content_hash == digest)
+    ).first()
+
+
+def register_resume_content(session: Session, digest: str, size_bytes: int) -> ResumeContent:
+    """
+    Record a newly stored PDF. Call after the file is in storage.
+    If a concurrent upload of the same bytes won the race, its row is returned.
+    ON CONFLICT DO NOTHING instead of catching the unique violation: a rollback
+    would expire the caller's objects (which async sessions can't reload).
+    """
+    dialect_insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    session.execute(
+        dialect_insert(ResumeContent)
+        .values(
+            content_hash=digest,
+            file_path=content_storage_path(digest),
+            size_bytes=size_bytes,
+            created_at=datetime.utcnow()
+        )
+        .on_conflict_do_nothing(index_elements=["content_hash"])
+    )
+    session.commit()
+    return get_resume_content(session, digest)
+
+
+def _mark_processing(ingestion_id: int) -> Optional[str]:
+    """Mark the ingestion as processing; returns already extracted text for its PDF, if any."""
+    with Session(engine) as session:
+        ingestion = session.get(ResumeIngestion, ingestion_id)
+        if not ingestion:
+            return None
+        ingestion.status = IngestionStatus.PROCESSING
+        session.add(ingestion)
+        session.commit()
+
+        content = get_resume_content(session, ingestion.content_hash)
+        # Empty text isn't reused (rows stored before it stopped being cached)
+        return (content.extracted_text or None) if content else None
+
+
+def _mark_failed(ingestion_id: int, error: str):
+    with Session(engine) as session:
+        ingestion = session.get(ResumeIngestion, ingestion_id)
+        if not ingestion:
+            return
+        ingestion.status = IngestionStatus.FAILED
+        ingestion.error = error[:500]
+        ingestion.completed_at = datetime.utcnow()
+        session.add(ingestion)
+        session.commit()
+
+        student = session.get(Student, ingestion.student_id)
+        if student:
+            _notify(
+                session,
+                student.user_id,
+                "Resume processing failed",
+                "Your resume was saved, but we couldn't process it. Please try uploading it again."
+            )
+
+
+def _notify(session: Session, user_id: int, title: str, message: str):
+    notification = Notification(
+        user_id=user_id,
+        type=NotificationType.SYSTEM,
+        title=title,
+        message=message,
+        link="/profile"
+    )
+    session.add(notification)
+    adjust_unread_count(session, user_id, 1)
+    session.commit()
+    session.refresh(notification)
+    publish_notification(session, notification)
+
+
+def _cache_embedding(session: Session, student: Student, content: Optional[ResumeContent]) -> bool:
+    """
+    Refresh the student's embedding cache, reusing the vector stored on the
+    resume content when the embedding input (skills + resume) is identical.
+    """
+    text_to_embed = build_student_embedding_text(student.skills, student.resume_text)
+    input_hash = content_hash(text_to_embed.encode("utf-8")) if text_to_embed else None
+
+    if content and content.embedding and input_hash and content.embedding_input_hash == input_hash:
+        logger.info(f"Reusing stored embedding for student {student.id}")
+        student.embedding_cache = content.embedding
+        student.embedding_updated_at = datetime.utcnow()
+        session.add(student)
+        session.commit()
+        return True
+
+    embedding = generate_and_cache_embedding(student, session, force_regenerate=True)
+    if embedding and content and input_hash:
+        content.embedding = student.embedding_cache
+        content.embedding_input_hash = input_hash
+        session.add(content)
+        session.commit()
+    return bool(embedding)
+
+
+def _store_results(ingestion_id: int, extracted_text: str, parsed: bool) -> bool:
+    """
+    Save the extracted text, refresh the embedding cache and mark the
+    ingestion completed. Blocking (DB + model inference), run in a thread.
+    parsed=True means non-empty text was just extracted and should be stored for reuse.
+    Returns whether the embedding was cached.
+    """
+    with Session(engine) as session:
+        ingestion = session.get(ResumeIngestion, ingestion_id)
+        if not ingestion:
+            return False
+        student = session.get(Student, ingestion.student_id)
+        if not student:
+            raise ValueError("Student profile not found")
+
+        # A newer upload owns the profile now; don't overwrite its text with ours
+        newer = session.exec(
+            select(ResumeIngestion.id)
+            .where(ResumeIngestion.student_id == student.id)
+            .where(ResumeIngestion.id > ingestion.id)
+            .limit(1)
+        ).first()
+        if newer:
+            ingestion.status = IngestionStatus.FAILED
+            ingestion.error = "Superseded by a newer upload"
+            ingestion.completed_at = datetime.utcnow()
+            session.add(ingestion)
+            session.commit()
+            return False
+
+        # 1. Share the parsed text with every upload of the same PDF
+        content = get_resume_content(session, ingestion.content_hash)
+        if content and parsed:
+            content.extracted_text = extracted_text
+            session.add(content)
+
+        # 2. Save resume text
+        student.resume_text = extracted_text
+        session.add(student)
+        session.commit()
+        session.refresh(student)
+
+        # 3. Refresh embedding cache with the new resume (non-fatal)
+        embedding_cached = False
+        try:
+            embedding_cached = _cache_embedding(session, student, content)
+        except Exception as e:
+            logger.error(f"Failed to generate embedding for ingestion {ingestion_id}: {e}", exc_info=True)
+
+        # 4. Mark completed and notify the student
+        ingestion.status = IngestionStatus.COMPLETED
+        ingestion.text_length = len(extracted_text)
+        ingestion.embedding_cached = embedding_cached
+        ingestion.completed_at = datetime.utcnow()
+        session.add(ingestion)
+        session.commit()
+
+        if extracted_text:
+            message = "Your resume has been processed and your job recommendations are up to date."
+        else:
+            message = "Your resume was saved, but we couldn't read any text from it. Try uploading a text-based PDF."
+        _notify(session, student.user_id, "Resume processed", message)
+
+        return embedding_cached
+
+
+async def process_resume_ingestion(ingestion_id: int, pdf_path: Optional[str]):
+    """
+    Background task scheduled by the resume upload endpoint.
+    pdf_path is the spooled upload (removed when done); it may be None when the
+    PDF was already parsed for an identical upload.
+    Never raises: failures are recorded on the ingestion row.
+    """
+    logger.info(f"=== Resume ingestion {ingestion_id} started ===")
+    try:
+        cached_text = await asyncio.to_thread(_mark_processing, ingestion_id)
+
+        # 1. Extract text in the PDF worker pool, unless this PDF was seen before
+        parsed = False
+        if cached_text is not None:
+            extracted_text = cached_text
+            logger.info(f"Ingestion {ingestion_id}: reusing extracted text of identical upload")
+        elif pdf_path is None:
+            raise ValueError("Resume content missing")
+        else:
+            try:
+                extracted_text = await pdf_worker_pool.extract_text(pdf_path)
+                # Nothing extracted (corrupt or image-only PDF): not cached either,
+                # so a later upload of the same file gets another try
+                parsed = bool(extracted_text)
+            except asyncio.TimeoutError:
+                # Not cached: a later upload of the same file gets another try
+                logger.error(f"Ingestion {ingestion_id}: PDF extraction timed out")
+                extracted_text = ""
+            logger.info(f"Ingestion {ingestion_id}: extracted {len(extracted_text)} characters")
+
+        # 2. Persist text, embedding and status
+        await asyncio.to_thread(_store_results, ingestion_id, extracted_text, parsed)
+        logger.info(f"=== Resume ingestion {ingestion_id} completed ===")
+
+    except Exception as e:
+        logger.error(f"Resume ingestion {ingestion_id} failed: {e}", exc_info=True)
+        try:
+            await asyncio.to_thread(_mark_failed, ingestion_id, str(e))
+        except Exception as status_error:
+            logger.error(f"Failed to record ingestion failure: {status_error}")
+    finally:
+        remove_spooled_file(pdf_path)
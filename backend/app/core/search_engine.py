@@ -3,6 +3,7 @@ from sqlmodel import Session, select, col, or_
 from app.models.job import Job
 from app.core.ai import ai_model
 from app.core.vector_db import vector_db
+from app.core.skill_taxonomy import get_taxonomy
 
 class SearchEngine:
     def __init__(self, session: Session):
@@ -22,10 +23,9 @@ class SearchEngine:
         elif "intern" in query_lower:
             intent = "internship_search"
 
-        # 2. Extract Common Tech Skills (Expand this list!)
+        # 2. Extract Common Tech Skills (query_keywords in the skill taxonomy)
         # In a real PRO app, an LLM does this. Here we use a fast lookup.
-        known_skills = ["python", "react", "sql", "fastapi", "django", "java", "c++", "aws", "docker", "node", "php", "html", "css"]
-        extracted_skills = [skill for skill in known_skills if skill in query_lower]
+        extracted_skills = get_taxonomy().find_query_keywords(query_lower)
 
         # 3. Extract Location (Simple heuristic)
         # Assuming location is often proper nouns, but for now let's just look for known cities
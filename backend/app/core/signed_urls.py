@@ -0,0 +1,287 @@
+"""
+Signed URL Cache
+Supabase signed URLs stay valid for SIGNED_URL_EXPIRES_SECONDS, so there is no
+need to sign the same object again on every request (/auth/me signs the
+profile image on every page load). URLs are cached per (bucket, path) and
+reused until SIGNED_URL_REFRESH_MARGIN_SECONDS before they expire.
+
+- Bounded: least recently used entries are dropped beyond SIGNED_URL_CACHE_SIZE.
+- Single-flight: concurrent misses for one key wait for a single signing call.
+- Failures are not cached; every waiter of the failed call gets the exception.
+- Lists sign their misses in bulk (get_signed_urls_async): one request per
+  chunk of paths per bucket, falling back to per-path signing on failure.
+
+Call invalidate_signed_url() after overwriting an object in place, so clients
+get a new URL instead of a cached copy of the old file.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.storage import storage
+
+logger = logging.getLogger(__name__)
+
+_Key = Tuple[str, str]
+
+
+class SignedURLCache:
+    def __init__(
+        self,
+        max_size: int,
+        expires_in: int,
+        refresh_margin: int,
+        bulk_chunk_size: int = 100,
+        bulk_concurrency: int = 4
+    ):
+        self.max_size = max_size
+        self.expires_in = expires_in
+        self.refresh_margin = refresh_margin
+        self.bulk_chunk_size = max(1, bulk_chunk_size)
+        self.bulk_concurrency = max(1, bulk_concurrency)
+        # key -> (url, reuse until (monotonic seconds))
+        self._entries: "OrderedDict[_Key, Tuple[str, float]]" = OrderedDict()
+        self._in_flight: Dict[_Key, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: _Key) -> Optional[str]:
+        """Cached URL if it's still fresh. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        url, fresh_until = entry
+        if time.monotonic() >= fresh_until:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return url
+
+    def _store(self, key: _Key, url: str, signed_at: float):
+        """Caller holds the lock."""
+        ttl = max(0, self.expires_in - self.refresh_margin)
+        self._entries[key] = (url, signed_at + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _claim(self, keys: Iterable[_Key]) -> Tuple[Dict[_Key, str], Dict[_Key, Future], Dict[_Key, Future]]:
+        """
+        Split keys into cached URLs, keys someone else is already signing
+        (their futures) and keys the caller now has to sign (new futures).
+        """
+        cached, waiting, owned = {}, {}, {}
+        with self._lock:
+            for key in keys:
+                url = self._lookup(key)
+                if url is not None:
+                    self.hits += 1
+                    cached[key] = url
+                    continue
+                self.misses += 1
+                future = self._in_flight.get(key)
+                if future is not None:
+                    waiting[key] = future
+                else:
+                    future = self._in_flight[key] = Future()
+                    owned[key] = future
+        return cached, waiting, owned
+
+    def _resolve(self, key: _Key, future: Future, url: Optional[str], signed_at: float):
+        with self._lock:
+            if url:
+                self._store(key, url, signed_at)
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        if not future.done():
+            future.set_result(url)
+
+    def _fail(self, key: _Key, future: Future, error: BaseException):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        if not future.done():
+            future.set_exception(error)
+
+    def _sign_one(self, key: _Key, future: Future) -> Optional[str]:
+        """Sign a claimed key with its own (blocking) request."""
+        bucket, path = key
+        try:
+            # Measured from before the call so the entry never outlives the URL
+            signed_at = time.monotonic()
+            url = storage.create_signed_url_sync(bucket, path, self.expires_in)
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._resolve(key, future, url, signed_at)
+        return url
+
+    async def _sign_one_async(self, key: _Key, future: Future) -> Optional[str]:
+        """Sign a claimed key with its own request on the async storage client."""
+        bucket, path = key
+        try:
+            signed_at = time.monotonic()
+            url = await storage.create_signed_url(bucket, path, self.expires_in)
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._resolve(key, future, url, signed_at)
+        return url
+
+    async def _sign_chunk(self, bucket: str, owned: Dict[str, Future]) -> Dict[str, Optional[str]]:
+        """
+        Sign claimed paths of one bucket with a single bulk request.
+        Paths the bulk request fails for are signed one by one; a path that
+        can't be signed at all maps to None.
+        """
+        paths = list(owned)
+        signed = {}
+        signed_at = time.monotonic()
+        try:
+            for item in await storage.create_signed_urls(bucket, paths, self.expires_in):
+                if not item.get("error") and item.get("signedURL"):
+                    signed[item["path"]] = item["signedURL"]
+        except Exception as e:
+            logger.warning(f"Bulk signing of {len(paths)} paths in '{bucket}' failed, signing one by one: {e}")
+
+        urls = {}
+        for path, future in owned.items():
+            key = (bucket, path)
+            if path in signed:
+                self._resolve(key, future, signed[path], signed_at)
+                urls[path] = signed[path]
+                continue
+            try:
+                urls[path] = await self._sign_one_async(key, future)
+            except Exception as e:
+                logger.error(f"Error generating signed URL for {bucket}/{path}: {e}")
+                urls[path] = None
+        return urls
+
+    def get(self, bucket: str, path: str) -> Optional[str]:
+        """
+        Signed URL for bucket/path, from the cache or freshly signed.
+        Blocking; use get_async() from async code.
+        Raises whatever the storage client raises.
+        """
+        if not path:
+            return None
+
+        key = (bucket, path)
+        cached, waiting, owned = self._claim([key])
+        if key in cached:
+            return cached[key]
+        if key in waiting:
+            # Someone else is already signing this object
+            return waiting[key].result()
+        return self._sign_one(key, owned[key])
+
+    async def get_async(self, bucket: str, path: str) -> Optional[str]:
+        """get() for async code: misses are signed on the async storage client."""
+        if not path:
+            return None
+
+        key = (bucket, path)
+        cached, waiting, owned = self._claim([key])
+        if key in cached:
+            return cached[key]
+        if key in waiting:
+            return await asyncio.wrap_future(waiting[key])
+        return await self._sign_one_async(key, owned[key])
+
+    async def get_many_async(self, items: Iterable[Tuple[str, Optional[str]]]) -> Dict[_Key, Optional[str]]:
+        """
+        Signed URLs for many (bucket, path) pairs, e.g. every file of a list page.
+        Cache misses are grouped by bucket and signed in bulk requests of
+        SIGNED_URL_BULK_CHUNK_SIZE paths, at most SIGNED_URL_BULK_CONCURRENCY
+        at a time. Never raises: pairs that can't be signed map to None.
+        """
+        keys = list(dict.fromkeys((bucket, path) for bucket, path in items if path))
+        urls: Dict[_Key, Optional[str]] = {}
+        cached, waiting, owned = self._claim(keys)
+        urls.update(cached)
+
+        # 1. Group the keys this call has to sign by bucket, in chunks
+        chunks = []
+        by_bucket: Dict[str, Dict[str, Future]] = {}
+        for (bucket, path), future in owned.items():
+            by_bucket.setdefault(bucket, {})[path] = future
+        for bucket, group in by_bucket.items():
+            paths = list(group)
+            for i in range(0, len(paths), self.bulk_chunk_size):
+                chunks.append((bucket, {path: group[path] for path in paths[i:i + self.bulk_chunk_size]}))
+
+        # 2. Sign the chunks, a few requests at a time
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def sign(bucket: str, chunk: Dict[str, Future]):
+            async with semaphore:
+                return bucket, await self._sign_chunk(bucket, chunk)
+
+        try:
+            for bucket, signed in await asyncio.gather(*(sign(bucket, chunk) for bucket, chunk in chunks)):
+                for path, url in signed.items():
+                    urls[(bucket, path)] = url
+        finally:
+            # Cancelled before every chunk started: release the keys nobody will sign
+            for key, future in owned.items():
+                if not future.done():
+                    self._fail(key, future, RuntimeError("Signing request was cancelled"))
+
+        # 3. Keys other requests were already signing
+        for key, future in waiting.items():
+            try:
+                urls[key] = await asyncio.wrap_future(future)
+            except Exception:
+                urls[key] = None
+
+        return urls
+
+    def invalidate(self, bucket: str, path: str):
+        with self._lock:
+            self._entries.pop((bucket, path), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Global instance
+signed_url_cache = SignedURLCache(
+    max_size=settings.SIGNED_URL_CACHE_SIZE,
+    expires_in=settings.SIGNED_URL_EXPIRES_SECONDS,
+    refresh_margin=settings.SIGNED_URL_REFRESH_MARGIN_SECONDS,
+    bulk_chunk_size=settings.SIGNED_URL_BULK_CHUNK_SIZE,
+    bulk_concurrency=settings.SIGNED_URL_BULK_CONCURRENCY
+)
+
+
+def get_signed_url(bucket: str, path: Optional[str]) -> Optional[str]:
+    return signed_url_cache.get(bucket, path)
+
+
+async def get_signed_url_async(bucket: str, path: Optional[str]) -> Optional[str]:
+    return await signed_url_cache.get_async(bucket, path)
+
+
+async def get_signed_urls_async(items: Iterable[Tuple[str, Optional[str]]]) -> Dict[Tuple[str, str], Optional[str]]:
+    return await signed_url_cache.get_many_async(items)
+
+
+def invalidate_signed_url(bucket: str, path: str):
+    signed_url_cache.invalidate(bucket, path)
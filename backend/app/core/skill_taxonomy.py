@@ -0,0 +1,252 @@
+"""
+Skill Taxonomy
+Loads the skill synonyms, display names and keyword lists from one data file
+and compiles them into lookup tables shared by every module that scans for skills.
+The compiled taxonomy is swapped atomically on reload, so no restart is needed.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "skill_taxonomy.json",
+)
+
+# How often (seconds) get_taxonomy() checks the data file for changes.
+# This lets every worker pick up an edited file, not only the one that got the reload call.
+RELOAD_CHECK_INTERVAL = 30
+
+# Bounds for the memoized skill normalization and display formatting
+NORMALIZE_CACHE_SIZE = 4096
+FORMAT_CACHE_SIZE = 4096
+
+
+def normalize_text(text: str) -> str:
+    """Normalize free text (job descriptions, resumes) the same way as skill names. Not cached."""
+    return text.lower().strip().replace('-', ' ').replace('_', ' ')
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_skill(skill: str) -> str:
+    """
+    Normalize skill name for matching.
+    Memoized and interned: skill names repeat constantly across jobs and students.
+    Use normalize_text() for long free text so it doesn't churn the cache.
+    """
+    return sys.intern(normalize_text(skill))
+
+
+class TermMatcher:
+    """
+    Finds which of a fixed set of terms occur anywhere in a text (substring semantics).
+
+    Terms are deduplicated and paired with their labels at compile time. Each lookup is
+    a C-level substring search (faster in CPython than a per-character automaton walk),
+    and terms whose labels have all been found already are skipped.
+    """
+
+    def __init__(self, terms: Dict[str, Iterable[Hashable]]):
+        merged: Dict[str, Set[Hashable]] = {}
+        for term, labels in terms.items():
+            if term:
+                merged.setdefault(term, set()).update(labels)
+        self._table = tuple((term, frozenset(labels)) for term, labels in merged.items())
+
+    def find(self, text: str) -> Set[Hashable]:
+        """Return the labels of every term occurring in text."""
+        found: Set[Hashable] = set()
+        if not text:
+            return found
+
+        for term, labels in self._table:
+            if labels <= found:
+                continue
+            if term in text:
+                found |= labels
+        return found
+
+
+class SkillTaxonomy:
+    """Compiled, read-only view of the skill taxonomy data file."""
+
+    def __init__(self, data: dict, source: Optional[str] = None):
+        self.version = data.get("version")
+        self.source = source
+        # Set when swapped in: increases with every reload in this process, unlike
+        # version (which an edited file may not bump). Lets caches key on the taxonomy.
+        self.generation = 0
+
+        # Canonical key -> normalized variations (file order is preserved;
+        # a variation listed under several keys belongs to the first group for synonym lookups)
+        self.synonyms: Dict[str, List[str]] = {}
+        for entry in data.get("skills", []):
+            key = entry["key"]
+            self.synonyms[key] = [normalize_skill(v) for v in entry.get("synonyms", [key])]
+
+        # Reverse map: normalized variation -> full variation set of its first group
+        self.variation_groups: Dict[str, FrozenSet[str]] = {}
+        # Canonical keys get small integer ids in alphabetical order,
+        # so sorting ids gives the same order as sorting key names
+        self.keys_by_id: List[str] = sorted(self.synonyms)
+        self.key_ids: Dict[str, int] = {key: i for i, key in enumerate(self.keys_by_id)}
+
+        # Normalized variation -> id of every canonical key it indicates
+        variation_ids: Dict[str, Set[int]] = {}
+        for key, variations in self.synonyms.items():
+            group = frozenset(variations)
+            for variation in variations:
+                self.variation_groups.setdefault(variation, group)
+                variation_ids.setdefault(variation, set()).add(self.key_ids[key])
+
+        # Display names keyed by normalized skill
+        self.display_names: Dict[str, str] = {
+            normalize_skill(k): v for k, v in data.get("display_names", {}).items()
+        }
+
+        self.trending_keywords: List[str] = list(data.get("trending_keywords", []))
+        self.query_keywords: List[str] = list(data.get("query_keywords", []))
+
+        # Memoized format_skill() results; a reload starts with a fresh cache
+        self._format_cache: Dict[str, str] = {}
+        self.display_by_id: List[str] = [self.format_skill(key) for key in self.keys_by_id]
+
+        # Compiled matchers
+        self._skill_matcher = TermMatcher(variation_ids)
+        self._trend_matcher = TermMatcher({k: [k] for k in self.trending_keywords})
+        self._query_matcher = TermMatcher({k: [k] for k in self.query_keywords})
+
+    def get_variations(self, skill: str) -> Set[str]:
+        """All normalized variations of a skill, or just the skill if it has no synonyms."""
+        normalized = normalize_skill(skill)
+        group = self.variation_groups.get(normalized)
+        return set(group) if group else {normalized}
+
+    def display_name(self, normalized_skill: str) -> Optional[str]:
+        return self.display_names.get(normalized_skill)
+
+    def format_skill(self, skill: str) -> str:
+        """Human-friendly display name for a skill (memoized)."""
+        cached = self._format_cache.get(skill)
+        if cached is not None:
+            return cached
+
+        normalized = normalize_skill(skill)
+        display = self.display_names.get(normalized)
+        if not display:
+            # Title-case words, but keep common abbreviations reasonable
+            if normalized.isupper():
+                display = normalized
+            else:
+                display = " ".join(part.capitalize() for part in normalized.split())
+
+        if len(self._format_cache) >= FORMAT_CACHE_SIZE:
+            self._format_cache.clear()
+        self._format_cache[skill] = display
+        return display
+
+    def extract_skill_ids(self, text: str) -> Set[int]:
+        """Integer ids of every skill whose variations occur in the text."""
+        if not text:
+            return set()
+        return self._skill_matcher.find(normalize_text(text))
+
+    def extract_skill_keys(self, text: str) -> Set[str]:
+        """Canonical keys of every skill whose variations occur in the text."""
+        return {self.keys_by_id[i] for i in self.extract_skill_ids(text)}
+
+    def find_trending_keywords(self, text: str) -> List[str]:
+        """Trending tech keywords (analytics) that occur in the text, in taxonomy order."""
+        if not text:
+            return []
+        found = self._trend_matcher.find(text.lower())
+        return [k for k in self.trending_keywords if k in found]
+
+    def find_query_keywords(self, text: str) -> List[str]:
+        """Known skills mentioned in a search query, in taxonomy order."""
+        if not text:
+            return []
+        found = self._query_matcher.find(text.lower())
+        return [k for k in self.query_keywords if k in found]
+
+
+def load_taxonomy(path: Optional[str] = None) -> SkillTaxonomy:
+    """Read and compile a taxonomy file. Raises on invalid data."""
+    path = path or settings.SKILL_TAXONOMY_PATH or DEFAULT_TAXONOMY_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return SkillTaxonomy(data, source=path)
+
+
+_taxonomy: Optional[SkillTaxonomy] = None
+_taxonomy_mtime: Optional[float] = None
+_last_check = 0.0
+_generation = 0
+_lock = threading.Lock()
+
+
+def _file_mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def reload_taxonomy(path: Optional[str] = None) -> SkillTaxonomy:
+    """
+    Compile the taxonomy file and swap it in atomically.
+    Readers holding the previous object keep a consistent view until they finish.
+    If the file is invalid the current taxonomy stays active and the error is raised.
+    """
+    global _taxonomy, _taxonomy_mtime, _last_check, _generation
+
+    new_taxonomy = load_taxonomy(path)
+    with _lock:
+        _generation += 1
+        new_taxonomy.generation = _generation
+        _taxonomy = new_taxonomy
+        _taxonomy_mtime = _file_mtime(new_taxonomy.source)
+        _last_check = time.monotonic()
+
+    logger.info(
+        f"Skill taxonomy v{new_taxonomy.version} loaded: "
+        f"{len(new_taxonomy.synonyms)} skills from {new_taxonomy.source}"
+    )
+    return new_taxonomy
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """
+    Shared compiled taxonomy for this process (compiled on first use).
+    Call once per operation and keep the returned reference for consistent lookups.
+    """
+    global _last_check
+
+    taxonomy = _taxonomy
+    if taxonomy is None:
+        with _lock:
+            if _taxonomy is not None:
+                return _taxonomy
+        return reload_taxonomy()
+
+    now = time.monotonic()
+    if now - _last_check > RELOAD_CHECK_INTERVAL:
+        _last_check = now
+        mtime = _file_mtime(taxonomy.source)
+        if mtime is not None and mtime != _taxonomy_mtime:
+            try:
+                return reload_taxonomy(taxonomy.source)
+            except Exception as e:
+                logger.error(f"Failed to reload skill taxonomy: {e}")
+
+    return taxonomy
@@ -0,0 +1,206 @@
+"""
+Async Storage Client
+Upload, signing and deletion of storage objects for async code, over one pooled
+HTTP/2 connection instead of the synchronous supabase client in a worker thread.
+
+Two backends, picked by STORAGE_BACKEND:
+- "supabase": the Supabase Storage REST API through a shared httpx.AsyncClient
+  (keep-alive pool, connect/read/write timeouts).
+- "local": files under STORAGE_LOCAL_DIR with file:// "signed" URLs, for
+  development and tests without the real service.
+
+Sync code (def endpoints) can still sign through create_signed_url_sync().
+"""
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import BinaryIO, Dict, List, Optional, Union
+from urllib.parse import quote
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FileData = Union[bytes, BinaryIO]
+
+
+class StorageError(Exception):
+    """A storage request failed (HTTP error status or transport error)."""
+
+
+def _quote_path(path: str) -> str:
+    return quote(path.lstrip("/"), safe="/")
+
+
+class SupabaseStorageClient:
+    """Supabase Storage REST API on a pooled httpx.AsyncClient."""
+
+    def __init__(self, url: str, key: str):
+        self.base_url = f"{url.rstrip('/')}/storage/v1"
+        self.key = key
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the connection pool on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.key}", "apikey": self.key},
+                http2=settings.STORAGE_HTTP2,
+                timeout=httpx.Timeout(settings.STORAGE_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=settings.STORAGE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.STORAGE_MAX_CONNECTIONS
+                )
+            )
+        return self._client
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        try:
+            response = await self._get_client().request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            raise StorageError(f"{method} {url} failed: {e}") from e
+        if response.status_code >= 400:
+            raise StorageError(f"{method} {url} returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    def _absolute_url(self, signed_path: Optional[str]) -> Optional[str]:
+        """The API returns signed URLs relative to /storage/v1."""
+        if not signed_path:
+            return None
+        return f"{self.base_url}{signed_path}"
+
+    async def upload(self, bucket: str, path: str, data: FileData, content_type: str, upsert: bool = True):
+        """Upload bytes or a binary file object (streamed, not read into memory)."""
+        filename = path.rsplit("/", 1)[-1]
+        await self._request(
+            "POST",
+            f"/object/{bucket}/{_quote_path(path)}",
+            files={"file": (filename, data, content_type)},
+            data={"cacheControl": "3600"},
+            headers={"x-upsert": "true" if upsert else "false"},
+            timeout=httpx.Timeout(settings.STORAGE_UPLOAD_TIMEOUT_SECONDS)
+        )
+
+    async def create_signed_url(self, bucket: str, path: str, expires_in: int) -> Optional[str]:
+        response = await self._request(
+            "POST",
+            f"/object/sign/{bucket}/{_quote_path(path)}",
+            json={"expiresIn": expires_in}
+        )
+        return self._absolute_url(response.json().get("signedURL"))
+
+    async def create_signed_urls(self, bucket: str, paths: List[str], expires_in: int) -> List[Dict]:
+        """
+        Sign many paths of one bucket in a single request.
+        Returns [{"path", "signedURL", "error"}] like the supabase client.
+        """
+        response = await self._request(
+            "POST",
+            f"/object/sign/{bucket}",
+            json={"expiresIn": expires_in, "paths": paths}
+        )
+        return [
+            {
+                "path": item.get("path"),
+                "signedURL": self._absolute_url(item.get("signedURL")),
+                "error": item.get("error"),
+            }
+            for item in response.json()
+        ]
+
+    def create_signed_url_sync(self, bucket: str, path: str, expires_in: int) -> Optional[str]:
+        """Blocking signing for sync code, through the supabase client."""
+        from app.core.supabase import supabase
+
+        res = supabase.storage.from_(bucket).create_signed_url(path, expires_in)
+        if isinstance(res, dict):
+            return res.get("signedURL")
+        return res if isinstance(res, str) else None
+
+    async def remove(self, bucket: str, paths: List[str]):
+        if not paths:
+            return
+        await self._request("DELETE", f"/object/{bucket}", json={"prefixes": paths})
+
+    async def aclose(self):
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+class LocalStorageBackend:
+    """
+    Fake storage on the local filesystem.
+    Signed URLs are file:// URLs with the expiry as a query parameter.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or os.path.join(tempfile.gettempdir(), "local-storage"))
+
+    def _file_path(self, bucket: str, path: str) -> str:
+        full = os.path.abspath(os.path.join(self.root, bucket, path.lstrip("/")))
+        if not full.startswith(os.path.join(self.root, bucket) + os.sep):
+            raise StorageError(f"Invalid storage path: {path}")
+        return full
+
+    def _write(self, bucket: str, path: str, data: FileData, upsert: bool):
+        target = self._file_path(bucket, path)
+        if not upsert and os.path.exists(target):
+            raise StorageError(f"{bucket}/{path} already exists")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as out:
+            if isinstance(data, bytes):
+                out.write(data)
+            else:
+                shutil.copyfileobj(data, out)
+
+    def _signed_url(self, bucket: str, path: str, expires_in: int) -> str:
+        target = self._file_path(bucket, path)
+        if not os.path.exists(target):
+            raise StorageError(f"{bucket}/{path} not found")
+        return f"file://{quote(target)}?expires={int(time.time()) + expires_in}"
+
+    async def upload(self, bucket: str, path: str, data: FileData, content_type: str, upsert: bool = True):
+        await asyncio.to_thread(self._write, bucket, path, data, upsert)
+
+    async def create_signed_url(self, bucket: str, path: str, expires_in: int) -> Optional[str]:
+        return self._signed_url(bucket, path, expires_in)
+
+    async def create_signed_urls(self, bucket: str, paths: List[str], expires_in: int) -> List[Dict]:
+        results = []
+        for path in paths:
+            try:
+                results.append({"path": path, "signedURL": self._signed_url(bucket, path, expires_in), "error": None})
+            except StorageError as e:
+                results.append({"path": path, "signedURL": None, "error": str(e)})
+        return results
+
+    def create_signed_url_sync(self, bucket: str, path: str, expires_in: int) -> Optional[str]:
+        return self._signed_url(bucket, path, expires_in)
+
+    async def remove(self, bucket: str, paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(self._file_path(bucket, path))
+            except FileNotFoundError:
+                pass
+
+    async def aclose(self):
+        pass
+
+
+def _create_storage():
+    if settings.STORAGE_BACKEND == "local":
+        logger.info(f"Using local storage backend in {settings.STORAGE_LOCAL_DIR or 'the temp directory'}")
+        return LocalStorageBackend(settings.STORAGE_LOCAL_DIR)
+    return SupabaseStorageClient(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+
+
+# Global instance
+storage = _create_storage()
@@ -0,0 +1,176 @@
+"""
+Upload Streaming Utilities
+Reads multipart uploads in fixed-size chunks so no handler holds an unbounded
+upload in memory:
+- UploadSizeLimitMiddleware rejects oversized request bodies while they are
+  still being received (Content-Length check, then a running byte count).
+- read_upload() / spool_upload() copy an UploadFile chunk by chunk, stop as soon
+  as the size limit is crossed and sniff the real file type from the first bytes.
+  PDFs are spooled to a named temp file that the extraction worker opens directly.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Dict, Optional
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Enough leading bytes to find every signature below
+# (PDF readers accept "%PDF-" anywhere in the first 1024 bytes)
+SNIFF_BYTES = 1024
+
+# Allowance for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Detect the file type from its leading bytes. Returns a MIME type or None."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if b"%PDF-" in head[:SNIFF_BYTES]:
+        return "application/pdf"
+    return None
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size: {max_bytes // (1024 * 1024)}MB"
+    )
+
+
+async def _iter_chunks(file: UploadFile, max_bytes: int):
+    """Yield the upload in chunks; raises 413 as soon as max_bytes is exceeded."""
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise _too_large(max_bytes)
+        yield chunk
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> tuple[bytes, Optional[str]]:
+    """
+    Read a small upload (e.g. an image) into memory, never more than max_bytes.
+    Returns (content, sniffed_content_type).
+    """
+    chunks = []
+    async for chunk in _iter_chunks(file, max_bytes):
+        chunks.append(chunk)
+    content = b"".join(chunks)
+    return content, sniff_content_type(content[:SNIFF_BYTES])
+
+
+class SpooledUpload:
+    """An upload copied to a named temp file, with its size, SHA-256 and sniffed type."""
+
+    def __init__(self, path: str, size: int, sha256: str, content_type: Optional[str]):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.content_type = content_type
+
+    def open(self):
+        return open(self.path, "rb")
+
+    def cleanup(self):
+        remove_spooled_file(self.path)
+
+
+def remove_spooled_file(path: Optional[str]):
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"Failed to remove spooled upload {path}: {e}")
+
+
+async def spool_upload(file: UploadFile, max_bytes: int, suffix: str = "") -> SpooledUpload:
+    """
+    Copy an upload to a named temp file in chunks, hashing as it goes.
+    The caller owns the file and must call cleanup() (or hand the path to
+    a background task that does).
+    """
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="upload_", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for chunk in _iter_chunks(file, max_bytes):
+                if len(head) < SNIFF_BYTES:
+                    head += chunk[:SNIFF_BYTES - len(head)]
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        remove_spooled_file(path)
+        raise
+
+    return SpooledUpload(path, size, digest.hexdigest(), sniff_content_type(head))
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware capping the request body size of upload endpoints.
+    Requests that declare a larger Content-Length are rejected before the body
+    is read; otherwise the body is counted while it streams in and the request
+    fails with 413 once the cap is crossed (chunked uploads included).
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        # path -> max body bytes (file limit plus multipart overhead)
+        self.limits = {path: limit + MULTIPART_OVERHEAD_BYTES for path, limit in limits.items()}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") not in ("POST", "PUT"):
+            return await self.app(scope, receive, send)
+
+        limit = self.limits.get(scope["path"].rstrip("/"))
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > limit:
+                    response = JSONResponse(
+                        status_code=413,
+                        content={"detail": _too_large(limit - MULTIPART_OVERHEAD_BYTES).detail}
+                    )
+                    return await response(scope, receive, send)
+                break
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside body parsing; FastAPI passes HTTPExceptions through
+                    raise _too_large(limit - MULTIPART_OVERHEAD_BYTES)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -56,6 +56,18 @@ class VectorDB:
             limit=limit
         ).points
 
+    def get_job_vector(self, job_id: int):
+        """Fetch the stored embedding of a job, or None if it isn't indexed."""
+        self._connect()
+        records = self.client.retrieve(
+            collection_name=settings.QDRANT_COLLECTION,
+            ids=[job_id],
+            with_vectors=True
+        )
+        if not records:
+            return None
+        return records[0].vector
+
     def delete_job(self, job_id: int):
         self._connect()
         self.client.delete(
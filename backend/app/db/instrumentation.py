@@ -0,0 +1,153 @@
+"""
+Per-request SQL Instrumentation
+Replaces engine echo: cursor events on every engine record how many
+statements a request ran, the total time spent in the database and the
+slowest statement. QueryStatsMiddleware scopes the numbers to one request,
+feeds them to the metrics registry (per route) and, with DEBUG on, returns
+them as X-DB-* response headers. Requests over DB_QUERY_COUNT_WARN statements
+are logged as likely N+1 queries.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_STATEMENT_CHARS = 200
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        # Set once the response is sent; background tasks still see this object
+        self.closed = False
+
+    def record(self, statement: str, elapsed: float):
+        if self.closed:
+            return
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+
+# Stats of the request being served. Sync routes run in worker threads with a
+# copy of the context, which still points at the same QueryStats object.
+# BackgroundTasks run inside the same app call after the response, so the stats
+# are closed (not reset) when the last body chunk goes out.
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def instrument_engine(engine: Engine):
+    """Attach the timing hooks (for an AsyncEngine, pass engine.sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _one_line(statement: Optional[str]) -> str:
+    return " ".join((statement or "").split())[:SLOWEST_STATEMENT_CHARS]
+
+
+def _route_template(scope) -> str:
+    """
+    Route template ("/jobs/{job_id}") of the matched route, so metrics aren't
+    split per id. Routes of included routers may only know the path below the
+    router prefix; the prefix is whatever part of the URL their pattern doesn't match.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    regex = getattr(route, "path_regex", None)
+    if not template or regex is None:
+        return "unmatched"
+
+    path = scope.get("path", "")
+    for i, char in enumerate(path):
+        if char == "/" and regex.match(path[i:]):
+            return path[:i] + template
+    return template
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware collecting QueryStats for every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        def finish():
+            if not stats.closed:
+                stats.closed = True
+                self._record(scope, stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.total_time * 1000:.1f}".encode()))
+                headers.append((b"x-db-slowest-ms", f"{stats.slowest_time * 1000:.1f}".encode()))
+                if stats.slowest_statement:
+                    headers.append((
+                        b"x-db-slowest-statement",
+                        _one_line(stats.slowest_statement).encode("ascii", "replace")
+                    ))
+                message["headers"] = headers
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            # Requests that failed before (or while) sending a response
+            finish()
+
+    def _record(self, scope, stats: QueryStats):
+        path = _route_template(scope)
+        method = scope.get("method", "")
+
+        metrics.observe("db_queries_per_request", stats.count, method=method, route=path)
+        metrics.observe("db_time_ms_per_request", stats.total_time * 1000, method=method, route=path)
+        if stats.count:
+            metrics.observe("db_slowest_statement_ms", stats.slowest_time * 1000, method=method, route=path)
+
+        if stats.count > settings.DB_QUERY_COUNT_WARN:
+            logger.warning(
+                f"{method} {path} ran {stats.count} queries ({stats.total_time * 1000:.1f}ms), "
+                f"possible N+1. Slowest ({stats.slowest_time * 1000:.1f}ms): {_one_line(stats.slowest_statement)}"
+            )
@@ -0,0 +1,204 @@
+"""
+Read Replica Routing
+Read-only endpoints take get_read_session(), which is bound to the replica
+(DATABASE_REPLICA_URL) unless:
+- no replica is configured,
+- the caller committed a write within REPLICA_READ_YOUR_WRITES_SECONDS
+  (so they always see their own changes), or
+- the replica failed its last health check (unreachable, or lagging more
+  than REPLICA_MAX_LAG_SECONDS); it's checked again after REPLICA_HEALTH_CHECK_SECONDS.
+In those cases the session is bound to the primary.
+
+Writes are noticed on any ORM session commit and attributed to the caller
+identified by ReadYourWritesMiddleware (the token subject).
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from jose import jwt, JWTError
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session as ORMSession
+from sqlmodel import Session, create_engine
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.instrumentation import instrument_engine
+from app.db.session import engine, _engine_options
+
+logger = logging.getLogger(__name__)
+
+# Only the WAL position matters on an idle primary, so compare it before the replay timestamp
+_PG_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+# Caller of the request being served (token subject), None for guests
+_request_user: ContextVar[Optional[str]] = ContextVar("request_user", default=None)
+
+
+class ReplicaRouter:
+    def __init__(self, replica: Optional[Engine], primary: Engine):
+        self.replica = replica
+        self.primary = primary
+        self._last_write: Dict[str, float] = {}
+        self._healthy = True
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+
+    def note_write(self, user_key: str):
+        now = time.monotonic()
+        window = settings.REPLICA_READ_YOUR_WRITES_SECONDS
+        with self._lock:
+            self._last_write[user_key] = now
+            if len(self._last_write) > 10000:
+                self._last_write = {k: t for k, t in self._last_write.items() if now - t < window}
+
+    def wrote_recently(self, user_key: Optional[str]) -> bool:
+        if not user_key:
+            return False
+        with self._lock:
+            written_at = self._last_write.get(user_key)
+        return written_at is not None and time.monotonic() - written_at < settings.REPLICA_READ_YOUR_WRITES_SECONDS
+
+    def mark_unhealthy(self, reason: str):
+        logger.warning(f"Read replica marked unhealthy: {reason}")
+        self._healthy = False
+        self._checked_at = time.monotonic()
+
+    def _check(self):
+        try:
+            with self.replica.connect() as conn:
+                if self.replica.dialect.name == "postgresql":
+                    lag = float(conn.execute(_PG_LAG_SQL).scalar() or 0)
+                else:
+                    conn.execute(text("SELECT 1"))
+                    lag = 0.0
+        except Exception as e:
+            self.mark_unhealthy(str(e).splitlines()[0] if str(e) else type(e).__name__)
+            return
+
+        metrics.set_gauge("db_replica_lag_seconds", lag)
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            self.mark_unhealthy(f"lag {lag:.1f}s")
+            return
+        if not self._healthy:
+            logger.info("Read replica healthy again")
+        self._healthy = True
+        self._checked_at = time.monotonic()
+
+    def replica_healthy(self) -> bool:
+        """Last health status, re-checked every REPLICA_HEALTH_CHECK_SECONDS (by one caller at a time)."""
+        if time.monotonic() - self._checked_at >= settings.REPLICA_HEALTH_CHECK_SECONDS:
+            if self._check_lock.acquire(blocking=False):
+                try:
+                    self._check()
+                finally:
+                    self._check_lock.release()
+        return self._healthy
+
+    def engine_for_read(self, user_key: Optional[str]) -> Engine:
+        if self.replica is None:
+            return self.primary
+        if self.wrote_recently(user_key):
+            metrics.inc("db_reads", target="primary", reason="read_your_writes")
+            return self.primary
+        if not self.replica_healthy():
+            metrics.inc("db_reads", target="primary", reason="replica_unhealthy")
+            return self.primary
+        metrics.inc("db_reads", target="replica")
+        return self.replica
+
+
+def _create_replica_engine() -> Optional[Engine]:
+    url = settings.DATABASE_REPLICA_URL
+    if not url:
+        return None
+    replica = create_engine(url, **_engine_options(url))
+    instrument_engine(replica)
+    return replica
+
+
+# Global instance
+replica_router = ReplicaRouter(_create_replica_engine(), engine)
+
+
+def get_read_session():
+    """
+    Session for read-only endpoints: the replica when it's safe, else the primary.
+    A connection error on the replica marks it unhealthy so the next
+    requests go to the primary.
+    """
+    bind = replica_router.engine_for_read(_request_user.get())
+    with Session(bind) as session:
+        try:
+            yield session
+        except DBAPIError as e:
+            if bind is not replica_router.primary and e.connection_invalidated:
+                replica_router.mark_unhealthy(str(e.orig) if e.orig else "connection lost")
+            raise
+
+
+# --- Write tracking (any ORM session, sync or async) ---
+
+@event.listens_for(ORMSession, "after_flush")
+def _after_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(ORMSession, "do_orm_execute")
+def _on_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(ORMSession, "after_commit")
+def _after_commit(session):
+    if session.info.pop("wrote", False):
+        user_key = _request_user.get()
+        if user_key:
+            replica_router.note_write(user_key)
+
+
+@event.listens_for(ORMSession, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("wrote", None)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware remembering who the request is from, so commits can be
+    attributed to them. The token isn't verified here: a forged subject can
+    only send reads to the primary; authentication happens in the endpoints.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or replica_router.replica is None:
+            return await self.app(scope, receive, send)
+
+        user_key = None
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    try:
+                        user_key = jwt.get_unverified_claims(token).get("sub")
+                    except JWTError:
+                        pass
+                break
+
+        reset = _request_user.set(user_key)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_user.reset(reset)
@@ -1,15 +1,54 @@
 # backend/app/db/session.py
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import create_engine, Session, SQLModel, text
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
 from app.models.auth import User, Student, Company
 
-# We add "pool_pre_ping=True" to prevent connection drops
-engine = create_engine(settings.DATABASE_URL, echo=True, pool_pre_ping=True)
+
+def _engine_options(url: str) -> dict:
+    """Pool settings from config (SQLite keeps SQLAlchemy's defaults)."""
+    options = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS
+        )
+    return options
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+instrument_engine(engine)
+
+
+def _async_database_url(url: str) -> str:
+    """Same database through an asyncio driver (asyncpg for Postgres)."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+# Async engine for async routes, so DB round trips don't block the event loop
+_async_url = settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(_async_url, **_engine_options(_async_url))
+instrument_engine(async_engine.sync_engine)
 
 def get_session():
     with Session(engine) as session:
         yield session
 
+async def get_async_session():
+    # expire_on_commit=False: attributes stay loaded after commit
+    # (lazy loading isn't available on async sessions)
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
 # Test function to check connection
 def check_db_connection():
     try:
@@ -9,8 +9,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.db.session import check_db_connection
+from app.db.session import check_db_connection, async_engine
 from app.core.vector_db import vector_db 
+from app.core.pdf_worker import pdf_worker_pool
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.db.instrumentation import QueryStatsMiddleware
+from app.db.replica import ReadYourWritesMiddleware
+from app.core.image_utils import MAX_FILE_SIZE_MB, shutdown_image_executor
+from app.core.storage import storage
+from app.core.pagination import CURSOR_HEADER
+from app.core.job_views import job_view_buffer, job_view_compactor
+from app.core.notification_stream import notification_broker
+from app.core.notification_counters import notification_counter_reconciler
+from app.core.notification_retention import notification_archiver
 from app.api.routes import auth, jobs, chat, students, companies, applications, analytics, admin, notifications
 
 # 1. Setup Logging
@@ -21,7 +32,21 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("App starting...")
+    job_view_buffer.start()
+    job_view_compactor.start()
+    await notification_broker.start()
+    notification_counter_reconciler.start()
+    notification_archiver.start()
     yield
+    await notification_archiver.stop()
+    await notification_counter_reconciler.stop()
+    await notification_broker.stop()
+    await job_view_compactor.stop()
+    await job_view_buffer.stop()
+    pdf_worker_pool.shutdown()
+    shutdown_image_executor()
+    await storage.aclose()
+    await async_engine.dispose()
     logger.info("App shutdown")
 
 # 3. Initialize App
@@ -59,13 +84,32 @@ origins = [
     "https://www.campuscareerai.me"
 ]
 
-# 5. Middleware (CORS)
+# 5. Middleware
+# Reject oversized uploads while the body is still streaming in
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/students/resume": settings.PDF_MAX_FILE_SIZE_MB * 1024 * 1024,
+        "/students/profile-image": MAX_FILE_SIZE_MB * 1024 * 1024,
+        "/companies/profile-image": MAX_FILE_SIZE_MB * 1024 * 1024,
+    },
+)
+
+# Per-request query count / DB time (X-DB-* headers in DEBUG, metrics always)
+app.add_middleware(QueryStatsMiddleware)
+
+# Who the request is from, so their reads skip the replica right after they write
+app.add_middleware(ReadYourWritesMiddleware)
+
+# CORS is added last so it's the outermost middleware: responses the ones above
+# send on their own (e.g. an early 413) still get the CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CURSOR_HEADER],
 )
 
 # 6. Register Routers
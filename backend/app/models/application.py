@@ -2,7 +2,7 @@ from typing import Optional
 from datetime import datetime
 from sqlmodel import SQLModel, Field
 from enum import Enum
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 
 # Define Status Enum
 class ApplicationStatus(str, Enum):
@@ -14,6 +14,12 @@ class ApplicationStatus(str, Enum):
 
 class Application(SQLModel, table=True):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Applicants of a job, newest first
+        Index("ix_applications_job_id_applied_at_id", "job_id", "applied_at", "id"),
+        # One application per student and job
+        Index("ix_applications_student_id_job_id", "student_id", "job_id", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     job_id: int = Field(sa_column_args=[ForeignKey("jobs.id", ondelete="CASCADE")])
@@ -2,7 +2,7 @@ from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 
 # 1. Define Roles
 class UserRole(str, Enum):
@@ -13,6 +13,10 @@ class UserRole(str, Enum):
 # 2. USERS Table
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin user list, newest first
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     email: str = Field(index=True, unique=True)
@@ -27,6 +31,10 @@ class User(SQLModel, table=True):
 # 3. STUDENTS Table
 class Student(SQLModel, table=True):
     __tablename__ = "students"
+    __table_args__ = (
+        # One student profile per user
+        Index("ix_students_user_id", "user_id", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     
@@ -1,11 +1,17 @@
 from typing import Optional, List
 from datetime import datetime
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import ForeignKey  # <--- Essential for CASCADE
+from sqlalchemy import ForeignKey, Index  # <--- Essential for CASCADE
 from app.models.auth import Company, User
 
 class Job(SQLModel, table=True):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Active job feed, newest first (id breaks created_at ties for keyset paging),
+        # and a company's own jobs
+        Index("ix_jobs_is_active_created_at_id", "is_active", "created_at", "id"),
+        Index("ix_jobs_company_id", "company_id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
@@ -27,6 +33,13 @@ class Job(SQLModel, table=True):
 
 class JobView(SQLModel, table=True):
     __tablename__ = "job_views"
+    __table_args__ = (
+        # Per-job view history and the duplicate-view check by IP
+        Index("ix_job_views_job_id_viewed_at", "job_id", "viewed_at"),
+        Index("ix_job_views_ip_address", "ip_address"),
+        # Compaction deletes rows past the retention window
+        Index("ix_job_views_viewed_at", "viewed_at"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     
@@ -41,8 +54,27 @@ class JobView(SQLModel, table=True):
     ip_address: Optional[str] = None
     viewed_at: datetime = Field(default_factory=datetime.utcnow)
 
+class JobViewRollup(SQLModel, table=True):
+    """Views of a job per hour or per day (bucket_start = start of the hour/day, UTC)."""
+    __tablename__ = "job_view_rollups"
+    __table_args__ = (
+        Index("ix_job_view_rollups_job_granularity_bucket", "job_id", "granularity", "bucket_start", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    # Link to Job with CASCADE DELETE
+    job_id: int = Field(sa_column_args=[ForeignKey("jobs.id", ondelete="CASCADE")])
+
+    granularity: str = Field(max_length=10)  # "hour" or "day"
+    bucket_start: datetime
+    views: int = Field(default=0)
+
 class SavedJob(SQLModel, table=True):
     __tablename__ = "saved_jobs"
+    __table_args__ = (
+        Index("ix_saved_jobs_user_id_job_id", "user_id", "job_id", unique=True),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     
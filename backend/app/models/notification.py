@@ -2,7 +2,7 @@ from typing import Optional
 from datetime import datetime
 from sqlmodel import SQLModel, Field
 from enum import Enum
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 
 
 class NotificationType(str, Enum):
@@ -13,6 +13,15 @@ class NotificationType(str, Enum):
 
 class Notification(SQLModel, table=True):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # A user's notifications, newest first
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Read notifications by age, for the retention job
+        Index(
+            "ix_notifications_read_created_at", "created_at",
+            postgresql_where=text("is_read"), sqlite_where=text("is_read")
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(sa_column_args=[ForeignKey("users.id", ondelete="CASCADE")])
@@ -30,3 +39,26 @@ class Notification(SQLModel, table=True):
     
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class NotificationCounter(SQLModel, table=True):
+    """Denormalized unread count per user, kept in step with notifications (see app.core.notification_counters)."""
+    __tablename__ = "notification_counters"
+
+    user_id: int = Field(sa_column_args=[ForeignKey("users.id", ondelete="CASCADE")], primary_key=True)
+    unread_count: int = Field(default=0)
+
+
+class NotificationArchive(SQLModel, table=True):
+    """Read notifications moved out of notifications by the retention job (same ids)."""
+    __tablename__ = "notifications_archive"
+
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    user_id: int = Field(sa_column_args=[ForeignKey("users.id", ondelete="CASCADE")], index=True)
+    type: NotificationType
+    title: str = Field(max_length=200)
+    message: str = Field(max_length=500)
+    link: Optional[str] = Field(default=None, max_length=300)
+    is_read: bool
+    created_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,57 @@
+from typing import Optional
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+from enum import Enum
+from sqlalchemy import ForeignKey
+
+
+class IngestionStatus(str, Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ResumeIngestion(SQLModel, table=True):
+    __tablename__ = "resume_ingestions"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    student_id: int = Field(sa_column_args=[ForeignKey("students.id", ondelete="CASCADE")])
+
+    # Storage path of the uploaded PDF and the SHA-256 of its bytes
+    file_path: str
+    content_hash: Optional[str] = Field(default=None, max_length=64)
+
+    # Pipeline state
+    status: IngestionStatus = Field(default=IngestionStatus.PENDING)
+    error: Optional[str] = Field(default=None, max_length=500)
+    text_length: Optional[int] = None
+    embedding_cached: bool = Field(default=False)
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+
+
+class ResumeContent(SQLModel, table=True):
+    """
+    Content-addressed resume store: one row per distinct PDF (SHA-256 of the bytes).
+    Identical uploads, from the same or different accounts, share the stored file,
+    the extracted text and the last computed embedding.
+    """
+    __tablename__ = "resume_contents"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    content_hash: str = Field(max_length=64, index=True, unique=True)
+    file_path: str
+    size_bytes: int
+
+    # Filled in by the ingestion pipeline (None = not parsed yet)
+    extracted_text: Optional[str] = None
+
+    # Embeddings depend on the student's skills too, so the cached vector is
+    # keyed by a hash of the full embedding input text
+    embedding: Optional[str] = None  # JSON array
+    embedding_input_hash: Optional[str] = Field(default=None, max_length=64)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
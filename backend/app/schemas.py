@@ -4,6 +4,7 @@ from app.models.auth import UserRole
 from typing import Optional
 from app.models.job import Job
 from app.models.application import ApplicationStatus
+from app.models.resume_ingestion import IngestionStatus
 from typing import List, Optional, Literal
 
 # 1. Schema for User Registration (What the Frontend sends)
@@ -98,6 +99,29 @@ class JobRecommendation(JobPublic):
     missing_skills: List[str] = []
     why: Optional[str] = None
 
+# Output Schema for Company viewing best-fit students for a job
+class CandidateMatch(BaseModel):
+    student_id: int
+    full_name: str
+    university: Optional[str] = None
+    city: Optional[str] = None
+    cgpa: Optional[float] = None
+    skills: Optional[str] = None
+    match_score: float
+    matching_skills: List[str] = []
+    missing_skills: List[str] = []
+    why: Optional[str] = None
+
+# Output Schema for resume ingestion status polling
+class ResumeIngestionPublic(BaseModel):
+    id: int
+    status: IngestionStatus
+    error: Optional[str] = None
+    text_length: Optional[int] = None
+    embedding_cached: bool = False
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
 class ChatQuery(BaseModel):
     query: str
 
@@ -185,6 +209,10 @@ class CompanyAnalytics(BaseModel):
     hiring_funnel: List[StatItem]
     applicant_skills: List[StatItem] 
 
+class ViewBucket(BaseModel):
+    bucket_start: datetime
+    views: int
+
 class StudentAnalytics(BaseModel):
     total_applications: int
     application_status: List[StatItem]
@@ -239,6 +267,8 @@ class NotificationList(BaseModel):
     notifications: List[NotificationPublic]
     unread_count: int
     total_count: int
+    # Cursor of the next page, None on the last one
+    next_cursor: Optional[str] = None
 
 class NotificationMarkRead(BaseModel):
     notification_ids: List[int]
\ No newline at end of file
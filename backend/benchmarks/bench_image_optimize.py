@@ -0,0 +1,141 @@
+"""
+Benchmark: optimize_profile_image (JPEG draft-mode decoding + bounded thread pool)
+
+Generates synthetic large images (phone-sized JPEG photos, CMYK and grayscale
+JPEGs, a transparent PNG), then reports:
+  1. per-image latency of the original implementation vs. the current one,
+     with output dimensions checked for parity;
+  2. throughput of a burst of concurrent uploads on the event loop, inline
+     (the old behaviour) vs. through optimize_profile_image_async.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_image_optimize
+    python -m benchmarks.bench_image_optimize --repeat 5 --burst 16
+"""
+import argparse
+import asyncio
+import time
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+from app.core.image_utils import (
+    JPEG_QUALITY,
+    MAX_IMAGE_SIZE,
+    optimize_profile_image,
+    optimize_profile_image_async,
+    shutdown_image_executor,
+)
+
+
+def reference_optimize_profile_image(image_bytes: bytes) -> bytes:
+    """The original implementation (no draft decoding), kept as the baseline."""
+    img = Image.open(BytesIO(image_bytes))
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    img.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+    output = BytesIO()
+    img.save(output, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return output.getvalue()
+
+
+def synthetic_photo(size, mode="RGB") -> Image.Image:
+    """Gradient + shapes + noise, so the encoder has realistic work to do."""
+    w, h = size
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.effect_noise(size, 40)
+    img = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    draw = ImageDraw.Draw(img)
+    for i in range(0, w, max(1, w // 12)):
+        draw.ellipse((i, h // 4, i + w // 10, h // 4 + h // 6), fill=(i % 255, 120, 200))
+    return img.convert(mode) if mode != "RGB" else img
+
+
+def encode(img: Image.Image, fmt: str, **kwargs) -> bytes:
+    out = BytesIO()
+    img.save(out, format=fmt, **kwargs)
+    return out.getvalue()
+
+
+def build_corpus():
+    photo = synthetic_photo((4032, 3024))
+    return [
+        ("JPEG 4032x3024 (12MP phone)", encode(photo, "JPEG", quality=92)),
+        ("JPEG 3024x4032 portrait", encode(photo.transpose(Image.Transpose.ROTATE_90), "JPEG", quality=92)),
+        ("JPEG 2000x1500", encode(photo.resize((2000, 1500)), "JPEG", quality=90)),
+        ("JPEG CMYK 3000x2000", encode(synthetic_photo((3000, 2000), "CMYK"), "JPEG", quality=90)),
+        ("JPEG gray 3000x3000", encode(synthetic_photo((3000, 3000), "L"), "JPEG", quality=90)),
+        ("JPEG 640x480 (small)", encode(photo.resize((640, 480)), "JPEG", quality=90)),
+        ("PNG RGBA 2400x2400", encode(synthetic_photo((2400, 2400), "RGBA"), "PNG")),
+    ]
+
+
+def best_of(func, data: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def burst(corpus, count: int, use_pool: bool) -> float:
+    """count concurrent 'uploads' handled on one event loop."""
+    payloads = [corpus[i % len(corpus)][1] for i in range(count)]
+
+    async def handle(data):
+        if use_pool:
+            return await optimize_profile_image_async(data)
+        return reference_optimize_profile_image(data)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handle(p) for p in payloads))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--burst", type=int, default=8)
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+
+    # 1. Latency per image
+    print(f"{'image':32} {'input':>9} {'original':>10} {'current':>10} {'speed-up':>9}  output")
+    total_old = total_new = 0.0
+    for name, data in corpus:
+        old_out = reference_optimize_profile_image(data)
+        new_out = optimize_profile_image(data)
+        old_size = Image.open(BytesIO(old_out)).size
+        new_size = Image.open(BytesIO(new_out)).size
+        if old_size != new_size:
+            print(f"DIMENSION MISMATCH for {name}: {old_size} vs {new_size}")
+            raise SystemExit(1)
+
+        old = best_of(reference_optimize_profile_image, data, args.repeat)
+        new = best_of(optimize_profile_image, data, args.repeat)
+        total_old += old
+        total_new += new
+        print(
+            f"{name:32} {len(data) / 1024:7.0f}KB {old * 1000:8.1f}ms {new * 1000:8.1f}ms "
+            f"{old / new:8.2f}x  {new_size[0]}x{new_size[1]}, {len(new_out) / 1024:.0f}KB"
+        )
+    print(f"{'total':32} {'':9} {total_old * 1000:8.1f}ms {total_new * 1000:8.1f}ms {total_old / total_new:8.2f}x")
+
+    # 2. Concurrent burst on the event loop
+    inline = asyncio.run(burst(corpus, args.burst, use_pool=False))
+    pooled = asyncio.run(burst(corpus, args.burst, use_pool=True))
+    shutdown_image_executor()
+    print(f"\nBurst of {args.burst} uploads: inline on event loop {inline * 1000:.0f}ms, "
+          f"thread pool {pooled * 1000:.0f}ms ({inline / pooled:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ from app.core.config import settings
 from app.models.auth import User, Student, Company
 from app.models.job import Job, SavedJob
 from app.models.application import Application
+from app.models.resume_ingestion import ResumeIngestion, ResumeContent
+from app.models.notification import Notification, NotificationCounter, NotificationArchive
 
 # this is the Alembic Config object
 config = context.config
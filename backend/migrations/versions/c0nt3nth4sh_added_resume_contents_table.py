@@ -0,0 +1,43 @@
+"""Added resume contents table for upload dedupe
+
+Revision ID: c0nt3nth4sh
+Revises: r3sum31ng3st
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0nt3nth4sh'
+down_revision: Union[str, None] = 'r3sum31ng3st'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resume_contents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.VARCHAR(64), nullable=False),
+        sa.Column('file_path', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('extracted_text', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('embedding', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('embedding_input_hash', sa.VARCHAR(64), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_resume_contents_content_hash', 'resume_contents', ['content_hash'], unique=True)
+
+    op.add_column('resume_ingestions', sa.Column('content_hash', sa.VARCHAR(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('resume_ingestions', 'content_hash')
+    op.drop_index('ix_resume_contents_content_hash', table_name='resume_contents')
+    op.drop_table('resume_contents')
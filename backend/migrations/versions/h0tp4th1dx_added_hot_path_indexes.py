@@ -0,0 +1,79 @@
+"""Added indexes for hot-path queries
+
+Revision ID: h0tp4th1dx
+Revises: c0nt3nth4sh
+Create Date: 2026-10-19 14:00:00.000000
+
+Indexes are built CONCURRENTLY (outside the migration transaction) so the
+tables stay writable while they build. A concurrent build that fails leaves
+an INVALID index behind; drop it and re-run the upgrade.
+
+Unique indexes where the code already expects one row:
+- applications(student_id, job_id): one application per student and job
+- saved_jobs(user_id, job_id): duplicate bookmarks are removed first
+- students(user_id): User.student_profile is one-to-one
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h0tp4th1dx'
+down_revision: Union[str, None] = 'c0nt3nth4sh'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, unique)
+INDEXES = [
+    ('ix_jobs_is_active_created_at', 'jobs', ['is_active', 'created_at'], False),
+    ('ix_jobs_company_id', 'jobs', ['company_id'], False),
+    ('ix_applications_job_id', 'applications', ['job_id'], False),
+    ('ix_applications_student_id_job_id', 'applications', ['student_id', 'job_id'], True),
+    ('ix_saved_jobs_user_id_job_id', 'saved_jobs', ['user_id', 'job_id'], True),
+    ('ix_job_views_job_id_viewed_at', 'job_views', ['job_id', 'viewed_at'], False),
+    ('ix_job_views_ip_address', 'job_views', ['ip_address'], False),
+    ('ix_students_user_id', 'students', ['user_id'], True),
+]
+
+
+def _check_no_duplicates(table: str, columns: list) -> None:
+    cols = ', '.join(columns)
+    duplicates = op.get_bind().execute(sa.text(
+        f"SELECT COUNT(*) FROM (SELECT {cols} FROM {table} GROUP BY {cols} HAVING COUNT(*) > 1) AS d"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{table} has {duplicates} duplicated ({cols}) groups; "
+            f"resolve them before creating the unique index"
+        )
+
+
+def upgrade() -> None:
+    # 1. Duplicate bookmarks are harmless to drop; duplicated applications or
+    #    student profiles need a human to decide which row to keep
+    op.execute(
+        "DELETE FROM saved_jobs WHERE id NOT IN "
+        "(SELECT MIN(id) FROM saved_jobs GROUP BY user_id, job_id)"
+    )
+    _check_no_duplicates('applications', ['student_id', 'job_id'])
+    _check_no_duplicates('students', ['user_id'])
+
+    # 2. Build the indexes without locking out writes
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=unique,
+                if_not_exists=True,
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
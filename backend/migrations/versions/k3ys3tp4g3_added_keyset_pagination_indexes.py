@@ -0,0 +1,53 @@
+"""Added indexes for keyset pagination
+
+Revision ID: k3ys3tp4g3
+Revises: h0tp4th1dx
+Create Date: 2026-10-19 16:00:00.000000
+
+Paged lists are ordered on (created_at, id) and continue after the last row
+of the previous page. Indexes ending in (created_at, id) serve every page as
+one range scan; they replace the narrower job feed and applicants indexes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k3ys3tp4g3'
+down_revision: Union[str, None] = 'h0tp4th1dx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_jobs_is_active_created_at_id', 'jobs', ['is_active', 'created_at', 'id']),
+    ('ix_applications_job_id_applied_at_id', 'applications', ['job_id', 'applied_at', 'id']),
+    ('ix_notifications_user_id_created_at_id', 'notifications', ['user_id', 'created_at', 'id']),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+]
+
+# Covered by the new indexes (same leading columns)
+REPLACED = [
+    ('ix_jobs_is_active_created_at', 'jobs', ['is_active', 'created_at']),
+    ('ix_applications_job_id', 'applications', ['job_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        for name, table, columns in REPLACED:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
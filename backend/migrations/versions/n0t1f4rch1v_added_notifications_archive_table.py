@@ -0,0 +1,56 @@
+"""Added notifications archive table
+
+Revision ID: n0t1f4rch1v
+Revises: u7r34dc0un7
+Create Date: 2026-10-19 21:00:00.000000
+
+Read notifications past the retention period move here (same ids). The
+partial index finds them without scanning unread or recent rows.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'n0t1f4rch1v'
+down_revision: Union[str, None] = 'u7r34dc0un7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notifications_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.VARCHAR(50), nullable=False),
+        sa.Column('title', sa.VARCHAR(200), nullable=False),
+        sa.Column('message', sa.VARCHAR(500), nullable=False),
+        sa.Column('link', sa.VARCHAR(300), nullable=True),
+        sa.Column('is_read', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notifications_archive_user_id', 'notifications_archive', ['user_id'], unique=False)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notifications_read_created_at', 'notifications', ['created_at'],
+            postgresql_where=sa.text('is_read'), sqlite_where=sa.text('is_read'),
+            if_not_exists=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notifications_read_created_at', table_name='notifications',
+            if_exists=True, postgresql_concurrently=True
+        )
+    op.drop_index('ix_notifications_archive_user_id', table_name='notifications_archive')
+    op.drop_table('notifications_archive')
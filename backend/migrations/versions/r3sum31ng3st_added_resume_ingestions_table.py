@@ -0,0 +1,43 @@
+"""Added resume ingestions table
+
+Revision ID: r3sum31ng3st
+Revises: n0t1f1c4t10ns
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'r3sum31ng3st'
+down_revision: Union[str, None] = 'n0t1f1c4t10ns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resume_ingestions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('file_path', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', name='ingestionstatus'), nullable=False),
+        sa.Column('error', sa.VARCHAR(500), nullable=True),
+        sa.Column('text_length', sa.Integer(), nullable=True),
+        sa.Column('embedding_cached', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_resume_ingestions_student_id', 'resume_ingestions', ['student_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resume_ingestions_student_id', table_name='resume_ingestions')
+    op.drop_table('resume_ingestions')
+    sa.Enum(name='ingestionstatus').drop(op.get_bind(), checkfirst=True)
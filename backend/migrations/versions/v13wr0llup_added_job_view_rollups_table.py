@@ -0,0 +1,60 @@
+"""Added job view rollups table
+
+Revision ID: v13wr0llup
+Revises: k3ys3tp4g3
+Create Date: 2026-10-19 18:00:00.000000
+
+Views per job per hour and per day. The existing job_views rows are rolled
+up here; from now on the view buffer updates the rollups when it flushes,
+and compaction prunes job_views rows older than the dedupe window.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'v13wr0llup'
+down_revision: Union[str, None] = 'k3ys3tp4g3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_view_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.VARCHAR(10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_job_view_rollups_job_granularity_bucket', 'job_view_rollups',
+        ['job_id', 'granularity', 'bucket_start'], unique=True
+    )
+
+    # Backfill from the raw rows recorded so far
+    for granularity in ('hour', 'day'):
+        op.execute(
+            "INSERT INTO job_view_rollups (job_id, granularity, bucket_start, views) "
+            f"SELECT job_id, '{granularity}', date_trunc('{granularity}', viewed_at), COUNT(*) "
+            f"FROM job_views GROUP BY job_id, date_trunc('{granularity}', viewed_at)"
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_job_views_viewed_at', 'job_views', ['viewed_at'],
+            if_not_exists=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_job_views_viewed_at', table_name='job_views', if_exists=True, postgresql_concurrently=True)
+    op.drop_index('ix_job_view_rollups_job_granularity_bucket', table_name='job_view_rollups')
+    op.drop_table('job_view_rollups')
@@ -0,0 +1,3 @@
+#!/bin/bash
+# Let the replica container stream WAL from the primary without a password
+echo "host replication all all trust" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,62 @@
+"""
+PDF worker pool: time spent waiting for a free worker must not count against
+a document's hard deadline, or queued uploads would get the pool recycled.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core import pdf_worker
+from app.core.config import settings
+from app.core.pdf_worker import pdf_worker_pool
+
+WORKERS = 2
+TIMEOUT = 2.0
+
+
+def slow_extract(source: bytes, max_pages: int, timeout: float) -> str:
+    """Stands in for extract_text_with_limits (runs in the worker processes)."""
+    time.sleep(float(source.decode()))
+    return f"slept {source.decode()}"
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pdf_worker_pool.shutdown()
+    monkeypatch.setattr(settings, "PDF_EXTRACT_WORKERS", WORKERS)
+    monkeypatch.setattr(settings, "PDF_EXTRACT_TIMEOUT_SECONDS", TIMEOUT)
+    monkeypatch.setattr(pdf_worker, "HARD_TIMEOUT_GRACE_SECONDS", 0.5)
+    monkeypatch.setattr(pdf_worker, "extract_text_with_limits", slow_extract)
+
+    recycled = []
+    recycle = pdf_worker_pool._recycle
+    monkeypatch.setattr(pdf_worker_pool, "_recycle", lambda executor: (recycled.append(executor), recycle(executor)))
+    yield recycled
+    pdf_worker_pool.shutdown()
+
+
+def test_queued_documents_dont_recycle_the_pool(pool):
+    async def run():
+        # Start the workers first, so process start-up isn't timed
+        await asyncio.gather(*(pdf_worker_pool.extract_text(b"0") for _ in range(WORKERS)))
+        # Each document fits its budget, but the last ones wait well past it for a worker
+        return await asyncio.gather(*(pdf_worker_pool.extract_text(b"1.2") for _ in range(WORKERS * 3)))
+
+    assert asyncio.run(run()) == ["slept 1.2"] * (WORKERS * 3)
+    assert pool == []
+
+
+def test_stuck_document_times_out_and_recycles_the_pool(pool):
+    async def run():
+        await asyncio.gather(*(pdf_worker_pool.extract_text(b"0") for _ in range(WORKERS)))
+        return await asyncio.gather(
+            pdf_worker_pool.extract_text(b"30"),
+            pdf_worker_pool.extract_text(b"0.2"),
+            return_exceptions=True
+        )
+
+    stuck, healthy = asyncio.run(run())
+    assert isinstance(stuck, asyncio.TimeoutError)
+    assert healthy == "slept 0.2"
+    assert len(pool) == 1
@@ -0,0 +1,156 @@
+"""
+The hot-path listing queries must be served by the indexes from the
+h0tp4th1dx / k3ys3tp4g3 migrations. Each query is built the way its endpoint
+builds it and EXPLAINed on a seeded, analyzed database. Sequential scans are
+disabled so the assertion is about which index *can* serve the query, not
+about the planner's choice on a small table.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, or_, text
+from sqlmodel import select
+
+from app.core.pagination import encode_cursor, keyset_paginate
+from app.models.application import Application
+from app.models.auth import Student, User
+from app.models.job import Job, SavedJob
+
+SEED_SQL = [
+    "INSERT INTO users (email, password_hash, role, created_at) "
+    "SELECT 'user' || g || '@test', 'x', "
+    "CASE WHEN g <= 50 THEN 'COMPANY' ELSE 'STUDENT' END::userrole, "
+    "now() - g * interval '1 minute' FROM generate_series(1, 2050) g",
+
+    "INSERT INTO companies (user_id, company_name) "
+    "SELECT id, 'Company ' || id FROM users WHERE role = 'COMPANY'",
+
+    "INSERT INTO students (user_id, full_name) "
+    "SELECT id, 'Student ' || id FROM users WHERE role = 'STUDENT'",
+
+    "INSERT INTO jobs (title, description, location, job_type, max_seats, is_active, created_at, company_id) "
+    "SELECT 'Job ' || g, 'Description', 'Lahore', 'Full-time', 1, g % 10 <> 0, "
+    "now() - g * interval '1 hour', (SELECT MIN(id) FROM companies) + g % 50 "
+    "FROM generate_series(1, 5000) g",
+
+    "INSERT INTO applications (job_id, student_id, status, applied_at) "
+    "SELECT j.id, s.id, 'APPLIED', now() - (j.id + s.id) * interval '1 minute' "
+    "FROM (SELECT id FROM jobs ORDER BY id LIMIT 100) j "
+    "CROSS JOIN (SELECT id FROM students ORDER BY id LIMIT 200) s",
+
+    "INSERT INTO saved_jobs (user_id, job_id, saved_at) "
+    "SELECT s.user_id, j.id, now() FROM (SELECT user_id FROM students ORDER BY id LIMIT 500) s "
+    "CROSS JOIN (SELECT id FROM jobs ORDER BY id LIMIT 20) j",
+
+    "ANALYZE",
+]
+
+CURSOR = encode_cursor(datetime(2026, 1, 1), 1000)
+
+
+@pytest.fixture(scope="module")
+def db(pg_engine):
+    with pg_engine.begin() as conn:
+        for sql in SEED_SQL:
+            conn.execute(text(sql))
+    return pg_engine
+
+
+def explain(engine, statement) -> dict:
+    """Root node of the JSON plan of statement (with sequential scans disabled)."""
+    compiled = statement.compile(dialect=engine.dialect)
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        conn.rollback()
+    return plan[0]["Plan"]
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def used_indexes(plan: dict) -> set:
+    return {node["Index Name"] for node in plan_nodes(plan) if "Index Name" in node}
+
+
+def has_sort(plan: dict) -> bool:
+    return any(node["Node Type"] in ("Sort", "Incremental Sort") for node in plan_nodes(plan))
+
+
+def job_feed(cursor=None):
+    # GET /jobs/
+    statement = (
+        select(Job)
+        .where(Job.is_active == True)
+        .where(or_(Job.deadline == None, Job.deadline > datetime.utcnow()))
+        .where(Job.company_id != 1)
+    )
+    return keyset_paginate(statement, Job.created_at, Job.id, cursor, 20)
+
+
+def applicants(cursor=None):
+    # GET /applications/job/{job_id}
+    statement = (
+        select(Application, Student, User)
+        .join(Student, Application.student_id == Student.id)
+        .join(User, Student.user_id == User.id)
+        .where(Application.job_id == 10)
+    )
+    return keyset_paginate(statement, Application.applied_at, Application.id, cursor, 20)
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR], ids=["first_page", "next_page"])
+def test_job_feed_walks_the_feed_index_without_sorting(db, cursor):
+    plan = explain(db, job_feed(cursor))
+    assert "ix_jobs_is_active_created_at_id" in used_indexes(plan)
+    assert not has_sort(plan)
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR], ids=["first_page", "next_page"])
+def test_applicants_walk_the_per_job_index_without_sorting(db, cursor):
+    plan = explain(db, applicants(cursor))
+    assert "ix_applications_job_id_applied_at_id" in used_indexes(plan)
+    assert not has_sort(plan)
+
+
+def test_company_jobs_use_company_index(db):
+    # GET /jobs/my-jobs
+    plan = explain(db, select(Job).where(Job.company_id == 3))
+    assert "ix_jobs_company_id" in used_indexes(plan)
+
+
+def test_application_count_per_job_uses_per_job_index(db):
+    # GET /jobs/my-jobs, applications_count of each job
+    plan = explain(db, select(func.count(Application.id)).where(Application.job_id == 10))
+    assert "ix_applications_job_id_applied_at_id" in used_indexes(plan)
+
+
+def test_saved_jobs_use_saved_jobs_index(db):
+    # GET /jobs/saved
+    plan = explain(db, select(SavedJob).where(SavedJob.user_id == 100).order_by(SavedJob.saved_at.desc()))
+    assert "ix_saved_jobs_user_id_job_id" in used_indexes(plan)
+
+
+@pytest.mark.parametrize("statement, index", [
+    # POST /applications/{job_id}
+    (
+        select(Application).where(Application.job_id == 10).where(Application.student_id == 5),
+        "ix_applications_student_id_job_id",
+    ),
+    # POST /jobs/{job_id}/save and is_saved on job lists
+    (
+        select(SavedJob).where(SavedJob.user_id == 100).where(SavedJob.job_id == 10),
+        "ix_saved_jobs_user_id_job_id",
+    ),
+    # Student profile of the current user
+    (
+        select(Student).where(Student.user_id == 100),
+        "ix_students_user_id",
+    ),
+], ids=["application", "saved_job", "student_profile"])
+def test_duplicate_checks_use_unique_indexes(db, statement, index):
+    plan = explain(db, statement)
+    assert used_indexes(plan) == {index}
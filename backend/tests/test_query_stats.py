@@ -0,0 +1,50 @@
+"""
+QueryStatsMiddleware: queries run by BackgroundTasks after the response is sent
+belong to no request and must not be counted against the route.
+"""
+import asyncio
+
+from fastapi import BackgroundTasks, FastAPI
+from sqlalchemy import create_engine, text
+
+from app.db.instrumentation import QueryStatsMiddleware, instrument_engine
+
+
+def run_queries(engine, n: int):
+    with engine.connect() as conn:
+        for _ in range(n):
+            conn.execute(text("SELECT 1"))
+
+
+def test_background_task_queries_are_not_counted(monkeypatch):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    app = FastAPI()
+
+    @app.get("/work")
+    def work(background_tasks: BackgroundTasks):
+        run_queries(engine, 2)
+        background_tasks.add_task(run_queries, engine, 100)
+        return {}
+
+    recorded = []
+    monkeypatch.setattr(QueryStatsMiddleware, "_record", lambda self, scope, stats: recorded.append(stats.count))
+    middleware = QueryStatsMiddleware(app)
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message["type"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/work", "raw_path": b"/work", "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(middleware(scope, receive, send))
+
+    assert sent == ["http.response.start", "http.response.body"]
+    # The background task ran, but only the route's own queries were recorded
+    assert recorded == [2]
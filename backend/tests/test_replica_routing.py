@@ -0,0 +1,164 @@
+"""
+Read replica routing against a real primary and streaming replica
+(TEST_DATABASE_URL / TEST_REPLICA_DATABASE_URL, see tests/docker-compose.yml).
+"""
+import asyncio
+import time
+
+import pytest
+from jose import jwt
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import Session, create_engine, select
+
+from app.core.config import settings
+from app.db.replica import ReadYourWritesMiddleware, ReplicaRouter, _request_user, get_read_session, replica_router
+from app.models.auth import User, UserRole
+
+
+@pytest.fixture
+def router(replica_engine):
+    """The app's router with a fresh state: replica healthy, no recent writes."""
+    replica_router._healthy = True
+    replica_router._checked_at = time.monotonic()
+    replica_router._last_write.clear()
+    yield replica_router
+    replica_router._healthy = True
+    replica_router._last_write.clear()
+
+
+@pytest.fixture
+def as_user():
+    """Serve the rest of the test as the given caller, like ReadYourWritesMiddleware does."""
+    tokens = []
+
+    def set_user(user_key):
+        tokens.append(_request_user.set(user_key))
+
+    yield set_user
+    for token in reversed(tokens):
+        _request_user.reset(token)
+
+
+def read_session():
+    """get_read_session() as FastAPI drives it: (session, generator to close or throw into)."""
+    generator = get_read_session()
+    return next(generator), generator
+
+
+def on_replica(session: Session) -> bool:
+    return session.execute(text("SELECT pg_is_in_recovery()")).scalar()
+
+
+def write_user(pg_engine, email: str):
+    with Session(pg_engine) as session:
+        session.add(User(email=email, password_hash="x", role=UserRole.STUDENT))
+        session.commit()
+
+
+def test_reads_go_to_replica(router):
+    session, generator = read_session()
+    try:
+        assert on_replica(session)
+    finally:
+        generator.close()
+
+
+def test_caller_reads_own_write_from_primary(router, pg_engine, as_user):
+    as_user("writer")
+    write_user(pg_engine, "rw-own@test")
+
+    session, generator = read_session()
+    try:
+        assert not on_replica(session)
+        assert session.exec(select(User).where(User.email == "rw-own@test")).first() is not None
+    finally:
+        generator.close()
+
+
+def test_other_callers_keep_reading_from_replica(router, pg_engine, as_user):
+    as_user("writer")
+    write_user(pg_engine, "rw-other@test")
+    as_user("reader")
+
+    session, generator = read_session()
+    try:
+        assert on_replica(session)
+    finally:
+        generator.close()
+
+
+def test_read_your_writes_window_expires(router, pg_engine, as_user, monkeypatch):
+    monkeypatch.setattr(settings, "REPLICA_READ_YOUR_WRITES_SECONDS", 0.2)
+    as_user("writer")
+    write_user(pg_engine, "rw-window@test")
+    assert router.engine_for_read("writer") is router.primary
+
+    time.sleep(0.3)
+    assert router.engine_for_read("writer") is router.replica
+
+
+def test_rolled_back_write_is_not_remembered(router, pg_engine, as_user):
+    as_user("writer")
+    with Session(pg_engine) as session:
+        session.add(User(email="rw-rollback@test", password_hash="x", role=UserRole.STUDENT))
+        session.flush()
+        session.rollback()
+
+    assert router.engine_for_read("writer") is router.replica
+
+
+def test_unreachable_replica_falls_back_to_primary(pg_engine):
+    down = create_engine("postgresql://postgres@127.0.0.1:1/campuscareer_test", pool_pre_ping=True)
+    router = ReplicaRouter(down, pg_engine)
+
+    assert router.engine_for_read(None) is pg_engine
+    assert not router._healthy
+
+
+def test_lagging_replica_falls_back_to_primary(replica_engine, pg_engine, monkeypatch):
+    monkeypatch.setattr(settings, "REPLICA_MAX_LAG_SECONDS", -1)
+    router = ReplicaRouter(replica_engine, pg_engine)
+
+    assert router.engine_for_read(None) is pg_engine
+
+
+def test_replica_is_used_again_once_health_check_passes(replica_engine, pg_engine, monkeypatch):
+    monkeypatch.setattr(settings, "REPLICA_HEALTH_CHECK_SECONDS", 3600)
+    router = ReplicaRouter(replica_engine, pg_engine)
+    router.mark_unhealthy("test")
+    # Not re-checked before the interval is up
+    assert router.engine_for_read(None) is pg_engine
+
+    monkeypatch.setattr(settings, "REPLICA_HEALTH_CHECK_SECONDS", 0)
+    assert router.engine_for_read(None) is replica_engine
+
+
+def test_lost_replica_connection_marks_replica_unhealthy(router, replica_engine):
+    session, generator = read_session()
+    pid = session.execute(text("SELECT pg_backend_pid()")).scalar()
+    with replica_engine.connect() as conn:
+        conn.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+
+    with pytest.raises(DBAPIError) as error:
+        session.execute(text("SELECT 1"))
+    with pytest.raises(DBAPIError):
+        generator.throw(error.value)
+
+    assert not router._healthy
+    assert router.engine_for_read(None) is router.primary
+
+
+def test_middleware_attributes_request_to_token_subject(router):
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(_request_user.get())
+
+    token = jwt.encode({"sub": "student@test"}, "any-key", algorithm="HS256")
+    middleware = ReadYourWritesMiddleware(app)
+    asyncio.run(middleware({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]}, None, None))
+    asyncio.run(middleware({"type": "http", "headers": []}, None, None))
+
+    assert seen == ["student@test", None]
+    assert _request_user.get() is None